@@ -5,8 +5,13 @@ This configuration includes improved randomization settings and
 human-like behavior patterns to avoid detection.
 """
 
+import array
+import bisect
+import itertools
 import os
 import random
+import sys
+from types import MappingProxyType, SimpleNamespace
 from typing import Dict, List, Tuple, Any
 
 # Basic paths
@@ -17,14 +22,16 @@ PROFILES_DIR = os.path.join(DATA_DIR, "linkedin_profiles")
 # Queue and memory file paths
 PROFILE_QUEUE_PATH = os.path.join(DATA_DIR, "profile_queue.json")
 MEMORY_PATH = os.path.join(DATA_DIR, "memory.json")
+MEMORY_COMPACT_INTERVAL = 5  # Max seconds a memory change waits for a durable snapshot
+MEMORY_COMPACT_EVENTS = 256  # Memory changes that trigger a snapshot before the interval
 
 # Session configuration
-SESSION_TYPES = [
+SESSION_TYPES = (
     {"name": "regular", "duration": (5, 7), "probability": 0.6, "max_profiles": 8},
     {"name": "short", "duration": (2, 6), "probability": 0.2, "max_profiles": 5},
     {"name": "long", "duration": (7, 13), "probability": 0.1, "max_profiles": 12},
     {"name": "quick", "duration": (2, 4), "probability": 0.1, "max_profiles": 3}
-]
+)
 
 # Browsing behavior configuration
 ACTIVE_HOURS = list(range(10, 21))  # 10 AM to 8 PM
@@ -48,7 +55,7 @@ SCROLL_PAUSE_TIME = (0.8, 3.0)  # seconds between scrolls
 
 # List of random sites to visit for idle behavior
 # These are safe, popular sites that won't trigger suspicion
-RANDOM_SITES = [
+RANDOM_SITES = (
     "https://www.wikipedia.org",
     "https://www.weather.com",
     "https://www.bbc.com/news",
@@ -67,10 +74,10 @@ RANDOM_SITES = [
     "https://www.nature.com",
     "https://www.scientificamerican.com",
     "https://www.smithsonianmag.com"
-]
+)
 
 # Section reading times (seconds)
-SECTION_READ_TIMES = {
+SECTION_READ_TIMES = MappingProxyType({
     "experience": (6, 12),
     "education": (4, 8),
     "skills": (3, 7),
@@ -84,7 +91,7 @@ SECTION_READ_TIMES = {
     "patents": (4, 8),
     "volunteer": (3, 6),
     "default": (3, 8)  # Default for any other section
-}
+})
 
 # Browser configuration
 BROWSER_CONFIG = {
@@ -99,39 +106,42 @@ LINKEDIN_FEED_URL = "https://www.linkedin.com/feed/"
 LINKEDIN_BASE_URL = "https://www.linkedin.com/"
 
 # System events
-EVENTS = {
-    "QUEUE_UPDATED": "queue_updated",
-    "SESSION_PLANNED": "session_planned",
-    "SESSION_STARTED": "session_started",  # This should match exactly
-    "SESSION_ENDED": "session_ended",
-    "PROFILE_SCRAPED": "profile_scraped",
-    "PROFILE_FAILED": "profile_failed",
-    "SYSTEM_STATE_CHANGED": "system_state_changed",
-    "ERROR": "error"
-}
+EVENTS_DICT = MappingProxyType({
+    "QUEUE_UPDATED": sys.intern("queue_updated"),
+    "SESSION_PLANNED": sys.intern("session_planned"),
+    "SESSION_STARTED": sys.intern("session_started"),  # This should match exactly
+    "SESSION_ENDED": sys.intern("session_ended"),
+    "PROFILE_SCRAPED": sys.intern("profile_scraped"),
+    "PROFILE_FAILED": sys.intern("profile_failed"),
+    "SYSTEM_STATE_CHANGED": sys.intern("system_state_changed"),
+    "ERROR": sys.intern("error")
+})
+EVENTS = SimpleNamespace(**EVENTS_DICT)
 
 # System States
-STATES = {
-    "INACTIVE": "inactive",
-    "WAITING_FOR_ACTIVE_HOURS": "waiting_for_active_hours",
-    "PLANNING_NEXT_SESSION": "planning_next_session",
-    "SESSION_STARTING": "session_starting",
-    "FEED_BROWSING": "feed_browsing",
-    "PROFILE_SCRAPING": "profile_scraping",
-    "SESSION_ENDING": "session_ending",
-    "COOLDOWN_PERIOD": "cooldown_period",
-    "ERROR": "error",
-    "RATE_LIMITED": "rate_limited",  # New state for handling rate limiting
-    "AUTHENTICATION_FAILURE": "authentication_failure"  # New state for auth issues
-}
+STATES_DICT = MappingProxyType({
+    "INACTIVE": sys.intern("inactive"),
+    "WAITING_FOR_ACTIVE_HOURS": sys.intern("waiting_for_active_hours"),
+    "PLANNING_NEXT_SESSION": sys.intern("planning_next_session"),
+    "SESSION_STARTING": sys.intern("session_starting"),
+    "FEED_BROWSING": sys.intern("feed_browsing"),
+    "PROFILE_SCRAPING": sys.intern("profile_scraping"),
+    "SESSION_ENDING": sys.intern("session_ending"),
+    "COOLDOWN_PERIOD": sys.intern("cooldown_period"),
+    "ERROR": sys.intern("error"),
+    "RATE_LIMITED": sys.intern("rate_limited"),  # New state for handling rate limiting
+    "AUTHENTICATION_FAILURE": sys.intern("authentication_failure")  # New state for auth issues
+})
+STATES = SimpleNamespace(**STATES_DICT)
 
 # Profile states
-PROFILE_STATES = {
-    "QUEUED": "queued",
-    "IN_PROGRESS": "in_progress",
-    "COMPLETED": "completed",
-    "FAILED": "failed"
-}
+PROFILE_STATES_DICT = MappingProxyType({
+    "QUEUED": sys.intern("queued"),
+    "IN_PROGRESS": sys.intern("in_progress"),
+    "COMPLETED": sys.intern("completed"),
+    "FAILED": sys.intern("failed")
+})
+PROFILE_STATES = SimpleNamespace(**PROFILE_STATES_DICT)
 
 # Chance of visiting random sites between profiles
 RANDOM_SITE_VISIT_CHANCE = 0.2  # 20% chance
@@ -145,6 +155,42 @@ IDLE_BEHAVIOR_CONFIG = {
     "max_profiles_before_idle": 4,  # Maximum profiles to scrape before idle
 }
 
-# Create necessary directories
-os.makedirs(DATA_DIR, exist_ok=True)
-os.makedirs(PROFILES_DIR, exist_ok=True)
\ No newline at end of file
+def ensure_dirs() -> None:
+    """Create the data directories used by the scraper if they don't exist."""
+    os.makedirs(DATA_DIR, exist_ok=True)
+    os.makedirs(PROFILES_DIR, exist_ok=True)
+
+# Precomputed sampling tables
+_SESSION_CHOICES = tuple(SESSION_TYPES)
+_SESSION_CDF = tuple(itertools.accumulate(t["probability"] for t in SESSION_TYPES))
+
+_SECTION_INDEX = {name: i for i, name in enumerate(SECTION_READ_TIMES)}
+_SECTION_LOWS = array.array('d', (low for low, _ in SECTION_READ_TIMES.values()))
+_SECTION_SPANS = array.array('d', (high - low for low, high in SECTION_READ_TIMES.values()))
+
+def pick_session_type(r=random.random) -> Dict[str, Any]:
+    """
+    Pick a session type according to the SESSION_TYPES probabilities.
+    
+    Args:
+        r: Random number source returning floats in [0, 1)
+        
+    Returns:
+        Selected session type (falls back to the first type)
+    """
+    index = bisect.bisect_left(_SESSION_CDF, r())
+    return _SESSION_CHOICES[index] if index < len(_SESSION_CHOICES) else _SESSION_CHOICES[0]
+
+def section_read_time(section: str, r=random.random) -> float:
+    """
+    Draw a reading time in seconds for a profile section.
+    
+    Args:
+        section: Section name (unknown sections use the "default" range)
+        r: Random number source returning floats in [0, 1)
+        
+    Returns:
+        Reading time in seconds
+    """
+    index = _SECTION_INDEX.get(section, _SECTION_INDEX["default"])
+    return _SECTION_LOWS[index] + _SECTION_SPANS[index] * r()
@@ -6,7 +6,10 @@ This script demonstrates how to batch process a list of LinkedIn profiles.
 
 import os
 import sys
+import atexit
 import logging
+import logging.handlers
+import queue
 import time
 import random  # Ensure random is imported at the top level
 import threading
@@ -15,30 +18,67 @@ import json
 import argparse
 from typing import List, Dict, Any
 
-# Configure logging
+# Configure logging: callers only enqueue records, a listener thread writes them out
+_log_queue = queue.Queue(-1)
 logging.basicConfig(
     level=logging.INFO,
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.StreamHandler(sys.stdout),
-        logging.FileHandler('linkedin_batch.log')
-    ]
+    handlers=[logging.handlers.QueueHandler(_log_queue)]
 )
+_log_listener = logging.handlers.QueueListener(
+    _log_queue,
+    logging.StreamHandler(sys.stdout),
+    logging.FileHandler('linkedin_batch.log', delay=True)
+)
+_log_listener.start()
+atexit.register(_log_listener.stop)
 
 logger = logging.getLogger(__name__)
 
+def _noop(*args, **kwargs) -> None:
+    pass
+
+def _bind_info() -> None:
+    """Rebind the cached info logger to match the current logger level."""
+    global _info
+    _info = logger.info if logger.isEnabledFor(logging.INFO) else _noop
+
+def set_log_level(level: int) -> None:
+    """
+    Change the script logger level and refresh the cached info binding.
+    
+    Args:
+        level: New logging level
+    """
+    logger.setLevel(level)
+    _bind_info()
+
+_bind_info()
+
+# Default profile list shipped next to this script
+DEFAULT_PROFILES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "default_profiles.txt")
+
+# Number of profiles handed to the batch processor per call
+ADD_CHUNK_SIZE = 500
+
+# Profile status updates buffered per session before the queue file is rewritten.
+# Each update is also in the status log, and a flush applies the whole log, so
+# flushing mid-session never drops entries logged elsewhere. Buffering per session
+# assumes a single writer: BatchProcessor runs one session at a time, so no other
+# session updates the same profiles between flushes.
+STATUS_FLUSH_EVERY = 20
+
+# Seconds between progress log lines while waiting for a batch
+HEARTBEAT_INTERVAL = 300
+
+# Shared generator for the batch script's timing jitter
+_rng = random.Random()
+
 # Add parent directory to path for imports
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from config.scraper_config import PROFILE_QUEUE_PATH, MEMORY_PATH, PROFILES_DIR
-from utils.event_bus import EventBus
-from utils.state_machine import StateMachine
-from services.linked_navigator.queue_manager import QueueManager
-from services.linked_navigator.brain import Brain
-from services.linked_navigator.batch_processor import BatchProcessor
-from services.linked_navigator.human_like_behavior import HumanLikeBehavior
-from services.linked_navigator.linkedin_navigator import LinkedInNavigator
-from utils.playwright_driver import PlaywrightDriver
+# Scraper modules are imported inside the functions that use them, so that
+# --help and argument errors don't pay for loading Playwright.
 
 def session_callback(session_data: Dict[str, Any]) -> Dict[str, Any]:
     """
@@ -50,6 +90,10 @@ def session_callback(session_data: Dict[str, Any]) -> Dict[str, Any]:
     Returns:
         Dictionary with session results
     """
+    from services.linked_navigator.human_like_behavior import HumanLikeBehavior
+    from services.linked_navigator.linkedin_navigator import LinkedInNavigator
+    from utils.playwright_driver import PlaywrightDriver
+    
     logger.info(f"Executing session: {session_data['id']}")
     session_id = session_data['id']
     
@@ -62,6 +106,18 @@ def session_callback(session_data: Dict[str, Any]) -> Dict[str, Any]:
         "start_time": datetime.now().isoformat()
     }
     
+    # Status updates are logged as they happen and written to the queue once per session
+    pending_updates = []
+    
+    def record_status(url: str, status: str, metadata: Dict[str, Any]) -> None:
+        queue_manager.log_profile_status(url, status, metadata)
+        pending_updates.append((url, status, metadata))
+        
+        # Bound how much a long session keeps only in the WAL (see STATUS_FLUSH_EVERY)
+        if len(pending_updates) >= STATUS_FLUSH_EVERY:
+            queue_manager.mark_profile_status_batch(pending_updates)
+            pending_updates.clear()
+    
     try:
         # Initialize shared browser
         logger.info("Initializing browser for session...")
@@ -75,12 +131,19 @@ def session_callback(session_data: Dict[str, Any]) -> Dict[str, Any]:
         
         headless = session_data.get('headless', False)
         
-        driver = PlaywrightDriver(
-            mode="profile_mode",
-            headless=headless,
-            profile_path=profile_path,
-            user_agent_type="random"
-        )
+        # Attach to a long-running Chrome when one is configured instead of launching a new one
+        cdp_endpoint = session_data.get('cdp_endpoint') or os.environ.get("CDP_WS_ENDPOINT")
+        
+        if cdp_endpoint:
+            logger.info(f"Attaching to running Chrome at {cdp_endpoint}")
+            driver = PlaywrightDriver(mode="cdp_mode", cdp_endpoint=cdp_endpoint)
+        else:
+            driver = PlaywrightDriver(
+                mode="profile_mode",
+                headless=headless,
+                profile_path=profile_path,
+                user_agent_type="random"
+            )
         
         # Start the browser with enough time
         logger.info("Starting browser...")
@@ -95,15 +158,21 @@ def session_callback(session_data: Dict[str, Any]) -> Dict[str, Any]:
         
         # Initialize behavior controller
         behavior = HumanLikeBehavior(driver)
+        
+        # Reuse section HTML fetched by a recent run when a cache directory is configured
+        html_cache_dir = session_data.get('html_cache_dir') or os.environ.get("HTML_CACHE_DIR")
                 
         # Process each profile in the session
         profiles = session_data.get("profiles", [])
         total_profiles = len(profiles)
-        logger.info(f"Processing {total_profiles} profiles in this session")
+        
+        # Draw all inter-profile delays (4.7 to 17.3 seconds) up front
+        delays = [_rng.uniform(4.7, 17.3) for _ in range(max(total_profiles - 1, 0))]
+        _info("Processing %d profiles in this session", total_profiles)
         
         for i, profile in enumerate(profiles, 1):
             profile_url = profile["url"]
-            logger.info(f"Processing profile {i}/{total_profiles}: {profile_url}")
+            _info("Processing profile %d/%d: %s", i, total_profiles, profile_url)
             
             try:
                 stats["profiles_started"] += 1
@@ -112,7 +181,8 @@ def session_callback(session_data: Dict[str, Any]) -> Dict[str, Any]:
                 navigator = LinkedInNavigator(
                     profile_url=profile_url,
                     driver=driver,
-                    behavior=behavior
+                    behavior=behavior,
+                    html_cache_dir=html_cache_dir
                 )
                 
                 # Scrape the profile
@@ -120,36 +190,27 @@ def session_callback(session_data: Dict[str, Any]) -> Dict[str, Any]:
                     # Save the profile data
                     profile_dir = navigator.save_profile_data()
                     
-                    # Update profile status in queue
-                    queue_manager.mark_profile_status(
-                        profile_url, 
-                        "completed", 
-                        {"saved_to": profile_dir}
-                    )
+                    # Record profile status for the queue
+                    record_status(profile_url, "completed", {"saved_to": profile_dir})
                     
                     stats["profiles_completed"] += 1
-                    logger.info(f"Successfully scraped profile: {profile_url}")
+                    _info("Successfully scraped profile: %s", profile_url)
                 else:
-                    # Update profile status in queue
-                    queue_manager.mark_profile_status(
-                        profile_url, 
-                        "failed", 
-                        {"error": navigator.last_error}
-                    )
+                    # Record profile status for the queue
+                    record_status(profile_url, "failed", {"error": navigator.last_error})
                     
                     stats["profiles_failed"] += 1
-                    logger.error(f"Failed to scrape profile: {profile_url}")
+                    logger.error("Failed to scrape profile: %s", profile_url)
             
             except Exception as e:
-                logger.error(f"Error processing profile {profile_url}: {str(e)}")
-                queue_manager.mark_profile_status(profile_url, "failed", {"error": str(e)})
+                logger.error("Error processing profile %s: %s", profile_url, e)
+                record_status(profile_url, "failed", {"error": str(e)})
                 stats["profiles_failed"] += 1
                 
             # Add a randomized delay between profiles for a more human-like pattern
             if i < total_profiles:  # Don't delay after the last profile
-                # More natural randomization with millisecond precision (4.7 to 17.3 seconds)
-                delay = 4.7 + random.random() * 12.6
-                logger.info(f"Waiting {delay:.2f} seconds before next profile...")
+                delay = delays[i - 1]
+                _info("Waiting %.2f seconds before next profile...", delay)
                 time.sleep(delay)
         
         # Close the shared browser
@@ -161,10 +222,32 @@ def session_callback(session_data: Dict[str, Any]) -> Dict[str, Any]:
         logger.error(f"Error executing session: {str(e)}")
         stats["error"] = str(e)
     
+    finally:
+        # Flush this session's status updates in a single queue write
+        queue_manager.mark_profile_status_batch(pending_updates)
+    
     # Record end time
     stats["end_time"] = datetime.now().isoformat()
     return stats
 
+def iter_profiles_file(path: str):
+    """
+    Lazily read profile URLs from a newline-delimited file.
+    
+    Blank lines and lines starting with '#' are skipped.
+    
+    Args:
+        path: Path to the profiles file
+        
+    Yields:
+        Profile URLs
+    """
+    with open(path, 'r') as f:
+        for line in f:
+            url = line.strip()
+            if url and not url.startswith("#"):
+                yield url
+
 def process_profiles(profile_list: List[str], headless: bool = False, clean_queue: bool = False) -> Dict[str, Any]:
     """
     Process a list of LinkedIn profiles.
@@ -179,6 +262,12 @@ def process_profiles(profile_list: List[str], headless: bool = False, clean_queu
     """
     global queue_manager
     
+    from config.scraper_config import EVENTS, ensure_dirs
+    from utils.event_bus import EventBus
+    from services.linked_navigator.queue_manager import QueueManager
+    from services.linked_navigator.brain import Brain
+    from services.linked_navigator.batch_processor import BatchProcessor
+    
     results = {
         "total_profiles": len(profile_list),
         "profiles_added": 0,
@@ -187,12 +276,14 @@ def process_profiles(profile_list: List[str], headless: bool = False, clean_queu
     }
     
     try:
+        # Ensure data directories exist
+        ensure_dirs()
+        
         # Initialize components
         logger.info("Initializing system components...")
         event_bus = EventBus.get_instance()
-        state_machine = StateMachine()
         queue_manager = QueueManager()
-        brain = Brain()
+        brain = Brain(queue_manager=queue_manager)
         batch_processor = BatchProcessor(brain, queue_manager)
         
         # Register session callback
@@ -203,45 +294,109 @@ def process_profiles(profile_list: List[str], headless: bool = False, clean_queu
             logger.info("Cleaning existing queue...")
             queue_manager.clear_queue()
         
-        # Start the brain
-        logger.info("Starting brain...")
-        brain.start()
-        
-        # Add profiles to queue
-        logger.info(f"Adding {len(profile_list)} profiles to queue...")
-        result = batch_processor.add_profiles(profile_list, initiator="test_batch")
+        # Subscribe to progress events before the brain starts and profiles are
+        # queued, so no completion can slip past; until the batch is known,
+        # events only update the set and never finish the wait. A failed
+        # profile counts as finished for this batch: the queue keeps it for a
+        # later retry, so waiting on it could only end in the timeout.
+        outstanding = set()
+        batch_known = False
+        progress_lock = threading.Lock()
+        done = threading.Event()
         
-        # Update results
-        results["profiles_added"] = len(result.get("added", []))
-        results["profiles_failed"] = len(result.get("failed", []))
-        results["already_queued"] = len(result.get("already_queued", []))
+        def _queue_pending_urls() -> set:
+            # Profiles the queue has neither completed nor seen fail
+            queue_total = queue_manager.get_queue_stats()["total"]
+            return {entry["url"] for entry in queue_manager.get_next_profiles(queue_total)
+                    if entry.get("status") != "failed"}
         
-        logger.info(f"Added profiles result: {result}")
+        def _on_progress(data: Any) -> None:
+            with progress_lock:
+                if isinstance(data, dict):
+                    if data.get("status") in ("completed", "failed"):
+                        outstanding.discard(data.get("url"))
+                    elif data.get("action") == "cleared":
+                        outstanding.clear()
+                if batch_known and not outstanding:
+                    done.set()
         
-        # Wait for processing to complete
-        logger.info("Waiting for profiles to be processed...")
+        def _on_session_ended(data: Any) -> None:
+            # Every status of a session is in the queue once it ends
+            with progress_lock:
+                if batch_known:
+                    outstanding.intersection_update(_queue_pending_urls())
+                    if not outstanding:
+                        done.set()
         
-        # Monitor until all profiles are processed or timeout
-        start_time = time.time()
-        timeout = 7200  # 2 hour timeout
+        progress_events = (
+            EVENTS.PROFILE_SCRAPED,
+            EVENTS.PROFILE_FAILED,
+            EVENTS.QUEUE_UPDATED
+        )
+        for event_type in progress_events:
+            event_bus.subscribe(event_type, _on_progress)
+        event_bus.subscribe(EVENTS.SESSION_ENDED, _on_session_ended)
         
-        # Randomized check interval between 25-35 seconds
-        while time.time() - start_time < timeout:
-            # Get queue stats
-            queue_stats = queue_manager.get_queue_stats()
-            brain_status = brain.get_status()
+        try:
+            # Start the brain
+            logger.info("Starting brain...")
+            brain.start()
             
-            logger.info(f"Queue stats: {queue_stats}")
-            logger.info(f"Brain state: {brain_status['state']}")
+            # Add profiles to queue
+            logger.info(f"Adding {len(profile_list)} profiles to queue...")
+            for start in range(0, len(profile_list), ADD_CHUNK_SIZE):
+                batch_processor.extend_batch(
+                    profile_list[start:start + ADD_CHUNK_SIZE],
+                    initiator="test_batch"
+                )
+            result = batch_processor.flush()
             
-            # Check if all profiles are done
-            if queue_stats["pending"] == 0 and queue_stats["completed"] > 0:
-                logger.info("All profiles processed!")
-                break
+            # Update results
+            results["profiles_added"] = len(result.get("added", []))
+            results["profiles_failed"] = len(result.get("failed", []))
+            results["already_queued"] = len(result.get("already_queued", []))
+            
+            logger.info(f"Added profiles result: {result}")
+            
+            # Wait for processing to complete
+            logger.info("Waiting for profiles to be processed...")
             
-            # Randomized wait before checking again (25-35 seconds with millisecond precision)
-            check_interval = 25 + random.random() * 10
-            time.sleep(check_interval)
+            # Track the profiles of this batch that the queue still has pending;
+            # anything finished before this point is already recorded there
+            with progress_lock:
+                outstanding.update(result.get("added", []))
+                outstanding.update(result.get("already_queued", []))
+                outstanding.intersection_update(_queue_pending_urls())
+                batch_known = True
+                if not outstanding:
+                    done.set()
+            
+            # Monitor until all profiles are processed or timeout
+            timeout = 7200  # 2 hour timeout
+            
+            deadline = time.monotonic() + timeout
+            while not done.is_set():
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                
+                # On each heartbeat, fall back to the queue itself in case an event was lost
+                if not done.wait(timeout=min(HEARTBEAT_INTERVAL, remaining)):
+                    with progress_lock:
+                        outstanding.intersection_update(_queue_pending_urls())
+                        if not outstanding:
+                            done.set()
+                        else:
+                            _info("Still waiting on %d profiles", len(outstanding))
+            
+            if done.is_set():
+                logger.info("All profiles processed!")
+            else:
+                logger.warning(f"Timed out after {timeout} seconds with {len(outstanding)} profiles outstanding")
+        finally:
+            for event_type in progress_events:
+                event_bus.unsubscribe(event_type, _on_progress)
+            event_bus.unsubscribe(EVENTS.SESSION_ENDED, _on_session_ended)
         
         # Get final stats
         final_queue_stats = queue_manager.get_queue_stats()
@@ -252,6 +407,8 @@ def process_profiles(profile_list: List[str], headless: bool = False, clean_queu
         # Stop the brain
         logger.info("Stopping brain...")
         brain.stop()
+        brain.close()
+        batch_processor.shutdown()
         
         logger.info("Batch processing completed")
         
@@ -262,6 +419,9 @@ def process_profiles(profile_list: List[str], headless: bool = False, clean_queu
         # Try to stop the brain
         if 'brain' in locals():
             brain.stop()
+            brain.close()
+        if 'batch_processor' in locals():
+            batch_processor.shutdown(wait=False)
     
     return results
 
@@ -274,8 +434,10 @@ def save_results(results: Dict[str, Any], filename: str = "batch_results.json")
         filename: Output filename
     """
     try:
-        with open(filename, 'w') as f:
-            json.dump(results, f, indent=2)
+        tmp_filename = filename + ".tmp"
+        with open(tmp_filename, 'w') as f:
+            f.write(json.dumps(results, indent=2))
+        os.replace(tmp_filename, filename)
         logger.info(f"Results saved to {filename}")
     except Exception as e:
         logger.error(f"Error saving results: {str(e)}")
@@ -286,8 +448,17 @@ def main():
     parser.add_argument("--headless", action="store_true", help="Run browser in headless mode")
     parser.add_argument("--clean", action="store_true", help="Clean existing queue before starting")
     parser.add_argument("--profiles", type=str, help="Path to JSON file with profile URLs")
+    parser.add_argument("--cdp-endpoint", type=str, help="Attach to a running Chrome at this DevTools endpoint")
+    parser.add_argument("--html-cache-dir", type=str,
+                        help="Cache section HTML here and reuse it for an hour on reruns")
     args = parser.parse_args()
     
+    if args.cdp_endpoint:
+        os.environ["CDP_WS_ENDPOINT"] = args.cdp_endpoint
+    
+    if args.html_cache_dir:
+        os.environ["HTML_CACHE_DIR"] = args.html_cache_dir
+    
     # Get profiles from command line argument or use defaults
     if args.profiles and os.path.exists(args.profiles):
         try:
@@ -299,31 +470,7 @@ def main():
             return
     else:
         # Default profiles list
-        profiles = [
-            "https://www.linkedin.com/in/angelikajarski/",
-            "https://www.linkedin.com/in/christy-page-ab34b0b/",
-            "https://www.linkedin.com/in/camilo-ramirez-cpa-7b90b027/",
-            "https://www.linkedin.com/in/damobird365/",
-            "https://www.linkedin.com/in/dan-maclachlan-61712348/",
-            "https://www.linkedin.com/in/dstoner/",
-            "https://www.linkedin.com/in/daniel-schorege-589232a2/",
-            "https://www.linkedin.com/in/david-harpur-778771151/",
-            "https://www.linkedin.com/in/david-fortin-cpa-816b20b5",
-            "https://www.linkedin.com/in/talwardeepak/",
-            "https://www.linkedin.com/in/delia-lazarean-34801590/",
-            "https://www.linkedin.com/in/diegosaenz2010/",
-            "https://www.linkedin.com/in/davidandrejohnsondaj/",
-            "https://www.linkedin.com/in/donnieschell/",
-            "https://www.linkedin.com/in/douglaspilot/",
-            "https://www.linkedin.com/in/deepakkamaraj",
-            "https://www.linkedin.com/in/andy-fleetham-555b4628",
-            "https://www.linkedin.com/in/dudley-h-peacock/",
-            "https://www.linkedin.com/in/eduardopadraomartins/"
-        ]
-    
-    # Ensure directories exist
-    os.makedirs(os.path.dirname(PROFILE_QUEUE_PATH), exist_ok=True)
-    os.makedirs(PROFILES_DIR, exist_ok=True)
+        profiles = list(iter_profiles_file(DEFAULT_PROFILES_PATH))
     
     # Process profiles
     results = process_profiles(profiles, headless=args.headless, clean_queue=args.clean)
@@ -7,11 +7,12 @@ with the Brain for scheduling and execution.
 """
 
 import logging
+import queue
+import re
 import threading
 import time
 from typing import List, Dict, Any, Optional, Callable
 from datetime import datetime
-import traceback
 
 from config.scraper_config import EVENTS, STATES
 from utils.event_bus import EventBus
@@ -21,6 +22,12 @@ from services.linked_navigator.brain import Brain
 
 logger = logging.getLogger(__name__)
 
+# Profile slug of a LinkedIn profile URL, with or without scheme and subdomain,
+# stopping before any sub-path, query or fragment (also validates the URL);
+# cleaned URLs are rebuilt on the canonical prefix
+_PROFILE_RE = re.compile(r'(?:https?://)?(?:[\w-]+\.)?linkedin\.com/in/([^/?#]+)')
+_CANONICAL_PREFIX = "https://www.linkedin.com/in/"
+
 class BatchProcessor:
     """
     Processes batches of LinkedIn profiles for scraping.
@@ -29,6 +36,12 @@ class BatchProcessor:
     and the Brain to manage and execute profile scraping tasks.
     """
     
+    __slots__ = (
+        "brain", "queue_manager", "event_bus", "state_machine", "session_callback",
+        "_active_sessions", "_active_lock", "_batch_lock", "_batch_results",
+        "_session_queue", "_session_worker", "_cached_state"
+    )
+    
     def __init__(self, brain: Brain, queue_manager: QueueManager):
         """
         Initialize the batch processor.
@@ -40,20 +53,36 @@ class BatchProcessor:
         self.brain = brain
         self.queue_manager = queue_manager
         self.event_bus = EventBus.get_instance()
-        self.state_machine = StateMachine()  # Using shared state machine
+        self.state_machine = StateMachine.get_instance()
         
-        self.processing_lock = threading.Lock()
+        # Number of sessions currently running; the lock only guards updates
+        self._active_sessions = 0
+        self._active_lock = threading.Lock()
         self.session_callback = None
         
+        # Results collected by extend_batch until the next flush
+        self._batch_lock = threading.Lock()
+        self._batch_results = self._new_results()
+        
+        # Sessions are handed off through a queue to a single worker thread
+        self._session_queue = queue.Queue()
+        self._session_worker = threading.Thread(target=self._run_sessions, name="session-worker", daemon=True)
+        self._session_worker.start()
+        
         # Register event handlers
         self._register_event_handlers()
+        
+        # Receive started sessions directly from the brain
+        self.brain.set_session_sink(self._handle_session_started)
+        
+        # Last known system state, kept current by SYSTEM_STATE_CHANGED events
+        self._cached_state = self.brain.state_machine.get_current_state()
     
     def _register_event_handlers(self) -> None:
         """Register handlers for system events."""
         # ADD THIS LOG
         logger.info("Registering BatchProcessor event handlers")
-        self.event_bus.subscribe(EVENTS["SESSION_STARTED"], self._handle_session_started)
-        self.event_bus.subscribe(EVENTS["SESSION_ENDED"], self._handle_session_ended)
+        self.event_bus.subscribe(EVENTS.SYSTEM_STATE_CHANGED, self._handle_state_changed)
         # ADD THIS LOG
         logger.info("BatchProcessor event handlers registered")
     
@@ -69,45 +98,121 @@ class BatchProcessor:
         Returns:
             Dictionary with results of the operation
         """
-        results = {
+        results = self._enqueue_profiles(profile_urls, urgent, initiator)
+        self._activate_if_needed(results)
+        return results
+    
+    def extend_batch(self, profile_urls: List[str], urgent: bool = False, initiator: str = "") -> None:
+        """
+        Queue profiles as part of a larger batch without activating the brain.
+        
+        Callers feeding profiles in many small pieces should use this and
+        call flush() once at the end, instead of calling add_profiles repeatedly.
+        
+        Args:
+            profile_urls: List of profile URLs to add
+            urgent: Whether these profiles should be processed urgently
+            initiator: Who/what initiated this request
+        """
+        results = self._enqueue_profiles(profile_urls, urgent, initiator)
+        
+        with self._batch_lock:
+            self._batch_results["success"] = self._batch_results["success"] and results["success"]
+            for key in ("added", "failed", "already_queued"):
+                self._batch_results[key].extend(results[key])
+    
+    def flush(self) -> Dict[str, Any]:
+        """
+        Finish a batch started with extend_batch and activate the brain once.
+        
+        Returns:
+            Dictionary with the combined results of the batch
+        """
+        with self._batch_lock:
+            results = self._batch_results
+            self._batch_results = self._new_results()
+        
+        self._activate_if_needed(results)
+        return results
+    
+    def _new_results(self) -> Dict[str, Any]:
+        """
+        Create an empty add-profiles result dictionary.
+        
+        Returns:
+            Dictionary with empty result lists
+        """
+        return {
             "success": True,
             "added": [],
             "failed": [],
             "already_queued": []
         }
+    
+    def _activate_if_needed(self, results: Dict[str, Any]) -> None:
+        """
+        Activate the brain if new profiles were added while it is inactive.
+        
+        Args:
+            results: Results of adding profiles
+        """
+        if results["added"] and self._cached_state == STATES.INACTIVE:
+            self.brain._check_and_activate()
+    
+    def _enqueue_profiles(self, profile_urls: List[str], urgent: bool, initiator: str) -> Dict[str, Any]:
+        """
+        Clean, de-duplicate and queue profiles.
         
+        Args:
+            profile_urls: List of profile URLs to add
+            urgent: Whether these profiles should be processed urgently
+            initiator: Who/what initiated this request
+            
+        Returns:
+            Dictionary with results of the operation
+        """
+        results = self._new_results()
+        
+        # Collect into local lists through bound appends; assigned to results once at the end
+        added, failed, already_queued = [], [], []
+        failed_append = failed.append
+        already_queued_append = already_queued.append
+        
+        # Clean all URLs up front
+        clean_urls = []
+        clean_urls_append = clean_urls.append
+        clean = self._clean_profile_url
         for url in profile_urls:
             try:
-                # Clean URL
-                clean_url = self._clean_profile_url(url)
-                
-                # Get current queue status
-                queue_before = self.queue_manager.get_queue_stats()
-                
-                # Add to queue
-                success = self.queue_manager.add_profile(clean_url, urgent, initiator)
-                
-                # Get updated queue status
-                queue_after = self.queue_manager.get_queue_stats()
-                
-                if success:
-                    # Check if it was a new addition or already queued
-                    if queue_after["total"] > queue_before["total"]:
-                        results["added"].append(clean_url)
-                    else:
-                        results["already_queued"].append(clean_url)
-                else:
-                    results["failed"].append(clean_url)
-                    results["success"] = False
-                    
+                clean_urls_append(clean(url))
             except Exception as e:
-                logger.error(f"Error adding profile {url}: {str(e)}")
-                results["failed"].append(url)
-                results["success"] = False
+                logger.error("Error adding profile %s: %s", url, e)
+                failed_append(url)
         
-        # Activate the brain if needed
-        if results["added"] and self.state_machine.get_current_state() == STATES["INACTIVE"]:
-            self.brain._check_and_activate()
+        # Drop repeats (e.g. the same profile with different tracking params), keeping order
+        unique_urls = list(dict.fromkeys(clean_urls))
+        if len(unique_urls) < len(clean_urls):
+            seen = set()
+            seen_add = seen.add
+            for clean_url in clean_urls:
+                if clean_url in seen:
+                    already_queued_append(clean_url)
+                else:
+                    seen_add(clean_url)
+        
+        # Add them to the queue in one pass
+        try:
+            by_status = {"added": added.append, "already_queued": already_queued_append}
+            for status, clean_url in self.queue_manager.add_profiles_bulk(unique_urls, urgent, initiator):
+                by_status[status](clean_url)
+        except Exception as e:
+            logger.error("Error adding profiles to queue: %s", e)
+            failed.extend(unique_urls)
+        
+        results["added"] = added
+        results["failed"] = failed
+        results["already_queued"] = already_queued
+        results["success"] = not failed
         
         return results
     
@@ -125,22 +230,34 @@ class BatchProcessor:
     
     def _handle_session_started(self, data: Dict[str, Any]) -> None:
         """
-        Handle session started event.
+        Accept a started session from the brain.
         
         Args:
             data: Session data
         """
-        # ADD THIS LOG
-        logger.info(f"BatchProcessor received session_started event: {data.get('id')}")
-        
-        if not self.session_callback:
-            logger.error("No session callback registered")
-            return
+        # Hand off to the session worker so the brain isn't held up
+        self._session_queue.put(data)
+    
+    def _run_sessions(self) -> None:
+        """Process queued sessions one after another until shut down."""
+        while True:
+            session_data = self._session_queue.get()
+            if session_data is None:
+                break
+            
+            logger.info("BatchProcessor processing session: %s", session_data.get('id'))
+            self._process_session(session_data)
+    
+    def shutdown(self, wait: bool = True) -> None:
+        """
+        Stop the session worker once queued sessions have been processed.
         
-        # ADD THIS LOG
-        logger.info("Starting session processing thread")
-        # Start a thread to process the session
-        threading.Thread(target=self._process_session, args=(data,)).start()
+        Args:
+            wait: Whether to block until the worker has finished
+        """
+        self._session_queue.put(None)
+        if wait:
+            self._session_worker.join()
     
     def _process_session(self, session_data: Dict[str, Any]) -> None:
         """
@@ -150,9 +267,8 @@ class BatchProcessor:
             session_data: Session data
         """
         session_id = session_data["id"]
-        profiles = session_data.get("profiles", [])
         
-        logger.info(f"Processing session {session_id} with {len(profiles)} profiles")
+        logger.info("Processing session %s with %d profiles", session_id, len(session_data.get("profiles") or ()))
         
         stats = {
             "profiles_started": 0,
@@ -160,39 +276,41 @@ class BatchProcessor:
             "profiles_failed": 0
         }
         
+        with self._active_lock:
+            self._active_sessions += 1
+        
         try:
-            # Lock to prevent concurrent session processing
-            with self.processing_lock:
-                # Execute the session callback
-                if self.session_callback:
-                    results = self.session_callback(session_data)
-                    
-                    # Update stats
-                    if results and isinstance(results, dict):
-                        stats.update(results)
-                    
-                    logger.info(f"Session {session_id} processing completed")
-                else:
-                    logger.error("No session callback registered")
+            # Execute the session callback
+            if self.session_callback:
+                results = self.session_callback(session_data)
+                
+                # Update stats
+                if results and isinstance(results, dict):
+                    stats.update(results)
+                
+                logger.info("Session %s processing completed", session_id)
+            else:
+                logger.error("No session callback registered")
         
         except Exception as e:
-            logger.error(f"Error processing session {session_id}: {str(e)}")
-            logger.error(traceback.format_exc())
+            logger.exception("Error processing session %s: %s", session_id, e)
             stats["error"] = str(e)
         
         finally:
+            with self._active_lock:
+                self._active_sessions -= 1
+            
             # Notify brain that session has ended
             self.brain.session_ended(session_id, stats)
     
-    def _handle_session_ended(self, data: Dict[str, Any]) -> None:
+    def _handle_state_changed(self, data: Dict[str, Any]) -> None:
         """
-        Handle session ended event.
+        Handle system state changed event.
         
         Args:
-            data: Session data
+            data: State change data
         """
-        # This is handled by the Brain, but we could add custom logic here if needed
-        pass
+        self._cached_state = data["new_state"]
     
     def _clean_profile_url(self, url: str) -> str:
         """
@@ -202,22 +320,22 @@ class BatchProcessor:
             url: Profile URL to clean
             
         Returns:
-            Cleaned profile URL
+            Profile URL in the form https://www.linkedin.com/in/<slug>
         """
         # Basic URL cleanup
         url = url.strip()
         
-        # Ensure it's a LinkedIn profile URL
-        if "linkedin.com/in/" not in url:
-            raise ValueError(f"Not a valid LinkedIn profile URL: {url}")
+        # Fast path for URLs that are already in canonical form
+        if (url.startswith(_CANONICAL_PREFIX) and len(url) > len(_CANONICAL_PREFIX)
+                and url.count("/") == 4 and "?" not in url and "#" not in url):
+            return url
         
-        # Extract the base profile URL (remove query parameters, etc.)
-        import re
-        match = re.match(r'(https?://(?:www\.)?linkedin\.com/in/[^/]+).*', url)
-        if match:
-            return match.group(1)
+        # Extract the profile slug and rebuild the URL in canonical form
+        match = _PROFILE_RE.match(url)
+        if not match:
+            raise ValueError(f"Not a valid LinkedIn profile URL: {url}")
         
-        return url
+        return _CANONICAL_PREFIX + match.group(1)
     
     def get_status(self) -> Dict[str, Any]:
         """
@@ -228,7 +346,7 @@ class BatchProcessor:
         """
         return {
             "queue_stats": self.queue_manager.get_queue_stats(),
-            "processing_active": self.processing_lock.locked(),
+            "processing_active": self._active_sessions > 0,
             "has_callback": self.session_callback is not None,
-            "system_state": self.state_machine.get_current_state()
+            "system_state": self._cached_state
         }
\ No newline at end of file
@@ -7,19 +7,23 @@ queue prioritization, and session execution based on human-like patterns.
 It now includes improved session management to avoid interrupting profiles.
 """
 
+import heapq
 import json
 import os
 import logging
+import queue
+import sqlite3
 import threading
 import time
 import random
-from typing import Dict, List, Any, Optional, Tuple
+from typing import Dict, List, Any, Optional, Tuple, Callable, Iterator
 from datetime import datetime, timedelta
 import traceback
 
 from config.scraper_config import (
-    MEMORY_PATH, STATES, EVENTS, SESSION_TYPES, 
-    ACTIVE_HOURS, SESSIONS_PER_HOUR, MINIMUM_SESSION_SPACING
+    MEMORY_PATH, MEMORY_COMPACT_INTERVAL, MEMORY_COMPACT_EVENTS, STATES, EVENTS, SESSION_TYPES, 
+    ACTIVE_HOURS, SESSIONS_PER_HOUR, MINIMUM_SESSION_SPACING,
+    pick_session_type
 )
 from utils.event_bus import EventBus
 from utils.state_machine import StateMachine
@@ -38,47 +42,111 @@ class Brain:
     and to handle session timing more naturally.
     """
     
-    def __init__(self, memory_path: str = MEMORY_PATH):
+    def __init__(self, memory_path: str = MEMORY_PATH, queue_manager: Optional[QueueManager] = None):
         """
         Initialize the Brain.
         
         Args:
             memory_path: Path to the memory file
+            queue_manager: Queue manager to share with other components (a new one is created if omitted)
         """
         self.memory_path = memory_path
+        self.wal_path = os.path.splitext(memory_path)[0] + ".wal"
+        self.db_path = os.path.splitext(memory_path)[0] + ".db"
         self.lock = threading.Lock()
         self.running = False
         self.thread = None
         
+        # Set on every state change so the main loop can sleep until something happens
+        self._wake = threading.Event()
+        self._last_cooldown_log = float("-inf")
+        
         # Initialize components
         self.event_bus = EventBus.get_instance()
-        self.state_machine = StateMachine(STATES["INACTIVE"])
-        self.queue_manager = QueueManager()
+        self._h_session_planned = self.event_bus.resolve(EVENTS.SESSION_PLANNED)
+        self._h_session_started = self.event_bus.resolve(EVENTS.SESSION_STARTED)
+        self._h_session_ended = self.event_bus.resolve(EVENTS.SESSION_ENDED)
+        self.state_machine = StateMachine.get_instance()
+        self.queue_manager = queue_manager or QueueManager()
         
         # Special hours configuration
         self._configure_special_hours()
         
-        # Session planning
-        self.next_sessions = []
+        # Next active hour after each hour of the day (wrapping to the first one tomorrow)
+        first_active_hour = min(ACTIVE_HOURS)
+        self._next_active_hour = [
+            min((hour for hour in ACTIVE_HOURS if hour > current), default=first_active_hour)
+            for current in range(24)
+        ]
+        self._cached_next_active_time = None
+        self._cached_for_hour = None
+        
+        # Session planning: plans by id, plus a heap of (planned start, id)
+        # whose entries for already started plans are dropped lazily
+        self._next_by_id = {}
+        self._next_heap = []
+        
+        # current_session is never mutated in place: writers build a new dict
+        # under _session_lock and swap it in, so readers need no lock
         self.current_session = None
+        self._session_lock = threading.RLock()
+        
+        # Short-lived snapshot of the queue statistics
+        self._queue_stats = None
+        self._queue_stats_expiry = 0.0
         
         # Profile tracking for session management
         self.profile_in_progress = False
         self.should_terminate_session = False
         self.session_overtime_allowed = 0  # Additional time allowed for completing a profile
         
+        # Direct consumer of started sessions (bypasses the EventBus when set)
+        self._session_sink = None
+        
         # Initialize memory if needed
         if not os.path.exists(memory_path):
             self._initialize_memory()
         
+        # Keep memory in-process; a single persistence thread applies queued
+        # events, appends them to the write-ahead log and compacts the snapshot
+        self._memory = self._read_memory()
+        self._dirty_events = 0
+        self.db = self._open_profile_db()
+        self._migrate_profiles()
+        self._migrate_days()
+        self._replay_wal()
+        
+        # Sessions per (date, hour) and the end epoch of the last one, kept
+        # so planning only needs today's session history
+        self._session_counts = {}
+        self._last_session_end = {}
+        for session in self._read_session_history(datetime.now().date().isoformat()):
+            self._index_session(session)
+        
+        self._wal = open(self.wal_path, 'a', buffering=1 << 16)
+        self._persist_q = queue.Queue()
+        self._persist_thread = threading.Thread(target=self._persist_loop, daemon=True)
+        self._persist_thread.start()
+        
+        # Main loop handler for each state that has scheduled work
+        self._state_dispatch = {
+            STATES.WAITING_FOR_ACTIVE_HOURS: self._handle_waiting_for_active_hours,
+            STATES.PLANNING_NEXT_SESSION: self._handle_planning_next_session,
+            STATES.COOLDOWN_PERIOD: self._handle_cooldown_period,
+            STATES.ERROR: self._handle_error_state,
+            STATES.SESSION_STARTING: self._handle_session_starting,
+            STATES.FEED_BROWSING: self._handle_session_active,
+            STATES.PROFILE_SCRAPING: self._handle_session_active
+        }
+        
         # Register event handlers
         self._register_event_handlers()
     
     def _register_event_handlers(self) -> None:
         """Register handlers for system events."""
-        self.event_bus.subscribe(EVENTS["QUEUE_UPDATED"], self._handle_queue_updated)
-        self.event_bus.subscribe(EVENTS["PROFILE_SCRAPED"], self._handle_profile_scraped)
-        self.event_bus.subscribe(EVENTS["PROFILE_FAILED"], self._handle_profile_failed)
+        self.event_bus.subscribe(EVENTS.QUEUE_UPDATED, self._handle_queue_updated)
+        self.event_bus.subscribe(EVENTS.PROFILE_SCRAPED, self._handle_profile_scraped)
+        self.event_bus.subscribe(EVENTS.PROFILE_FAILED, self._handle_profile_failed)
     
     def _handle_queue_updated(self, data: Dict[str, Any]) -> None:
         """
@@ -87,9 +155,12 @@ class Brain:
         Args:
             data: Event data
         """
-        if self.state_machine.get_current_state() == STATES["INACTIVE"]:
+        # The queue changed, so any cached statistics are stale
+        self._queue_stats = None
+        
+        if self.state_machine.get_current_state() == STATES.INACTIVE:
             # If system is inactive but we have queued profiles, start planning
-            queue_stats = self.queue_manager.get_queue_stats()
+            queue_stats = self._get_queue_stats()
             if queue_stats["pending"] > 0:
                 self._check_and_activate()
     
@@ -100,13 +171,21 @@ class Brain:
         Args:
             data: Event data
         """
-        if self.current_session:
-            # Update session metrics
-            self.current_session["profiles_completed"] = self.current_session.get("profiles_completed", 0) + 1
-            self.current_session["last_activity"] = datetime.now().isoformat()
-            
+        now_iso = datetime.now().isoformat()
+        
+        with self._session_lock:
+            session = self.current_session
+            if session:
+                # Update session metrics
+                self.current_session = {
+                    **session,
+                    "profiles_completed": session.get("profiles_completed", 0) + 1,
+                    "last_activity": now_iso
+                }
+        
+        if session:
             # Record in memory
-            self._update_memory_with_profile(data["url"], "completed", data.get("metadata", {}))
+            self._update_memory_with_profile(data["url"], "completed", data.get("metadata", {}), now_iso)
     
     def _handle_profile_failed(self, data: Dict[str, Any]) -> None:
         """
@@ -115,25 +194,33 @@ class Brain:
         Args:
             data: Event data
         """
-        if self.current_session:
-            # Update session metrics
-            self.current_session["profiles_failed"] = self.current_session.get("profiles_failed", 0) + 1
-            self.current_session["last_activity"] = datetime.now().isoformat()
-            
+        now_iso = datetime.now().isoformat()
+        
+        with self._session_lock:
+            session = self.current_session
+            if session:
+                # Update session metrics
+                self.current_session = {
+                    **session,
+                    "profiles_failed": session.get("profiles_failed", 0) + 1,
+                    "last_activity": now_iso
+                }
+        
+        if session:
             # Record in memory
-            self._update_memory_with_profile(data["url"], "failed", data.get("metadata", {}))
+            self._update_memory_with_profile(data["url"], "failed", data.get("metadata", {}), now_iso)
     
     def _check_and_activate(self) -> None:
         """Check conditions and activate the system if appropriate."""
         current_state = self.state_machine.get_current_state()
         
-        if current_state == STATES["INACTIVE"]:
+        if current_state == STATES.INACTIVE:
             # Check if we have pending profiles
-            queue_stats = self.queue_manager.get_queue_stats()
+            queue_stats = self._get_queue_stats()
             if queue_stats["pending"] > 0:
                 # Transition to waiting for active hours
-                self.state_machine.transition(
-                    STATES["WAITING_FOR_ACTIVE_HOURS"],
+                self._transition(
+                    STATES.WAITING_FOR_ACTIVE_HOURS,
                     "System activated due to pending profiles"
                 )
                 
@@ -141,6 +228,64 @@ class Brain:
                 if not self.running:
                     self.start()
     
+    def _get_queue_stats(self) -> Dict[str, Any]:
+        """
+        Get queue statistics, reusing a snapshot taken less than 500 ms ago.
+        
+        Returns:
+            Queue statistics
+        """
+        now = time.monotonic()
+        stats = self._queue_stats
+        if stats is None or now >= self._queue_stats_expiry:
+            stats = self.queue_manager.get_queue_stats()
+            self._queue_stats = stats
+            self._queue_stats_expiry = now + 0.5
+        return stats
+    
+    def _transition(self, new_state: str, reason: str = "", data: Optional[Dict[str, Any]] = None) -> bool:
+        """
+        Transition the state machine and wake the main loop.
+        
+        Args:
+            new_state: State to transition to
+            reason: Reason for the transition
+            data: Optional state data
+            
+        Returns:
+            True if the transition happened
+        """
+        result = self.state_machine.transition(new_state, reason, data)
+        self._wake.set()
+        return result
+    
+    def _next_active_time(self, now: datetime) -> datetime:
+        """
+        Get the start of the next active hour after the current hour.
+        
+        The result is cached until the hour rolls over.
+        
+        Args:
+            now: Current time
+            
+        Returns:
+            Start of the next active hour, tomorrow if none is left today
+        """
+        cached = self._cached_next_active_time
+        if cached is not None and now.hour == self._cached_for_hour and now < cached:
+            return cached
+        
+        next_active_hour = self._next_active_hour[now.hour]
+        next_time = now.replace(hour=next_active_hour, minute=0, second=0, microsecond=0)
+        
+        if next_active_hour <= now.hour:
+            # No more active hours today, use first hour tomorrow
+            next_time += timedelta(days=1)
+        
+        self._cached_next_active_time = next_time
+        self._cached_for_hour = now.hour
+        return next_time
+    
     def _configure_special_hours(self) -> None:
         """Configure special hours for today."""
         today = datetime.now().date()
@@ -163,9 +308,6 @@ class Brain:
         
         # Create basic memory structure
         memory = {
-            "last_updated": datetime.now().isoformat(),
-            "days": {},
-            "profiles": {},
             "statistics": {
                 "total_sessions": 0,
                 "total_profiles_scraped": 0,
@@ -173,8 +315,7 @@ class Brain:
             }
         }
         
-        with open(self.memory_path, 'w') as f:
-            json.dump(memory, f, indent=2)
+        self._write_memory(memory)
     
     def _read_memory(self) -> Dict[str, Any]:
         """
@@ -184,9 +325,10 @@ class Brain:
             Memory data
         """
         try:
-            with open(self.memory_path, 'r') as f:
-                return json.load(f)
-        except (json.JSONDecodeError, FileNotFoundError):
+            # Read the snapshot in one call and decode the bytes directly
+            with open(self.memory_path, 'rb') as f:
+                return json.loads(f.read())
+        except (json.JSONDecodeError, UnicodeDecodeError, FileNotFoundError):
             logger.warning(f"Memory file at {self.memory_path} not found or invalid. Initializing.")
             self._initialize_memory()
             return self._read_memory()
@@ -200,44 +342,338 @@ class Brain:
         """
         memory["last_updated"] = datetime.now().isoformat()
         
-        with open(self.memory_path, 'w') as f:
-            json.dump(memory, f, indent=2)
+        # Serialize compactly in one go and hand it to a large buffered writer
+        data = json.dumps(memory, separators=(",", ":")).encode("utf-8")
+        
+        # Write to a temp file and swap it in so readers never see a partial file
+        tmp_path = self.memory_path + ".tmp"
+        with open(tmp_path, 'wb', buffering=1 << 20) as f:
+            f.write(data)
+            # Snapshots are the only fsync point; the write-ahead log is never synced
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.memory_path)
     
-    def _update_memory_with_session(self, session_data: Dict[str, Any]) -> None:
+    def _open_profile_db(self) -> sqlite3.Connection:
         """
-        Update memory with session data.
+        Open the SQLite database holding per-profile history.
+        
+        Returns:
+            Connection in autocommit mode, shared with the persistence thread
+        """
+        db = sqlite3.connect(self.db_path, check_same_thread=False, isolation_level=None)
+        db.execute("PRAGMA journal_mode=WAL")
+        db.execute("PRAGMA synchronous=NORMAL")
+        db.execute(
+            "CREATE TABLE IF NOT EXISTS profiles ("
+            "url TEXT PRIMARY KEY, first_seen TEXT, last_updated TEXT, last_status TEXT)"
+        )
+        db.execute(
+            "CREATE TABLE IF NOT EXISTS profile_history ("
+            "url TEXT NOT NULL, ts TEXT, status TEXT, meta TEXT)"
+        )
+        db.execute("CREATE INDEX IF NOT EXISTS profile_history_url ON profile_history(url)")
+        return db
+    
+    def _migrate_profiles(self) -> None:
+        """Move profiles kept in an older memory file into the profile database."""
+        profiles = self._memory.pop("profiles", None)
+        if not profiles:
+            return
+        
+        self.db.execute("BEGIN")
+        for url, profile in profiles.items():
+            self.db.execute(
+                "INSERT OR REPLACE INTO profiles(url, first_seen, last_updated, last_status) VALUES(?, ?, ?, ?)",
+                (url, profile.get("first_seen"), profile.get("last_updated"), profile.get("last_status"))
+            )
+            self.db.executemany(
+                "INSERT INTO profile_history(url, ts, status, meta) VALUES(?, ?, ?, ?)",
+                [(url, entry.get("timestamp"), entry.get("status"), json.dumps(entry.get("metadata")))
+                 for entry in profile.get("history", [])]
+            )
+        self.db.execute("COMMIT")
+        
+        self._write_memory(self._memory)
+        logger.info(f"Moved {len(profiles)} profiles from {self.memory_path} to {self.db_path}")
+    
+    def _migrate_days(self) -> None:
+        """Move per-day session history kept in an older memory file into daily session files."""
+        days = self._memory.pop("days", None)
+        if days is None:
+            return
+        
+        for date_str, hours in days.items():
+            # A crash before the memory rewrite below leaves "days" in place, so skip
+            # sessions an earlier, interrupted migration already appended
+            path = self._session_history_path(date_str)
+            written = set()
+            torn = False
+            try:
+                with open(path, 'r') as f:
+                    for line in f:
+                        written.add(line.rstrip("\n"))
+                        torn = not line.endswith("\n")
+            except FileNotFoundError:
+                pass
+            
+            with open(path, 'a') as f:
+                if torn:
+                    # End the torn line so it stays a single unreadable record
+                    f.write("\n")
+                for hour in sorted(hours, key=int):
+                    for session in hours[hour]["sessions"]:
+                        line = json.dumps(session, separators=(",", ":"))
+                        if line not in written:
+                            f.write(line + "\n")
+        
+        self._write_memory(self._memory)
+        logger.info(f"Moved session history for {len(days)} days out of {self.memory_path}")
+    
+    def _session_history_path(self, date_str: str) -> str:
+        """
+        Get the path of the session history file for a day.
+        
+        Args:
+            date_str: ISO date
+            
+        Returns:
+            Path of the line-delimited JSON file holding that day's sessions
+        """
+        return os.path.join(os.path.dirname(self.memory_path), f"sessions-{date_str}.jsonl")
+    
+    def _append_session_history(self, session_data: Dict[str, Any]) -> None:
+        """
+        Append a session to the history file for the day it started.
         
         Args:
             session_data: Session data to record
         """
-        with self.lock:
-            memory = self._read_memory()
+        date_str = session_data["start_time"][:10]
+        with open(self._session_history_path(date_str), 'a') as f:
+            f.write(json.dumps(session_data, separators=(",", ":")) + "\n")
+    
+    def _read_session_history(self, date_str: str) -> Iterator[Dict[str, Any]]:
+        """
+        Stream the sessions recorded for a day.
+        
+        Args:
+            date_str: ISO date
             
-            # Get date and hour
-            session_time = datetime.fromisoformat(session_data["start_time"])
-            date_str = session_time.date().isoformat()
-            hour = session_time.hour
+        Yields:
+            Session records in the order they were written
+        """
+        try:
+            with open(self._session_history_path(date_str), 'r') as f:
+                for line in f:
+                    try:
+                        yield json.loads(line)
+                    except json.JSONDecodeError:
+                        # Torn final line from an interrupted append
+                        continue
+        except FileNotFoundError:
+            return
+    
+    def _apply_record(self, record: Dict[str, Any]) -> None:
+        """
+        Apply one event record to the in-memory copy or the profile database.
+        
+        Args:
+            record: Event record from the queue or the write-ahead log
+        """
+        if record["t"] == "session":
+            self._apply_session(self._memory, record["session"])
+            if "seq" in record:
+                # The snapshot remembers the last logged record it contains
+                self._memory["wal_seq"] = record["seq"]
+        elif record["t"] == "profile":
+            self._upsert_profile(record["url"], record["status"], record["meta"], record["ts"])
+    
+    def _replay_wal(self) -> None:
+        """Apply events logged since the last snapshot to the in-memory copy."""
+        if not os.path.exists(self.wal_path):
+            return
+        
+        replayed = 0
+        self.db.execute("BEGIN")
+        with open(self.wal_path, 'r') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    # Torn final line from an interrupted append
+                    continue
+                
+                # Skip records a snapshot written before a crash already counted
+                if record.get("seq", 0) and record["seq"] <= self._memory.get("wal_seq", 0):
+                    continue
+                
+                self._apply_record(record)
+                replayed += 1
+        self.db.execute("COMMIT")
+        
+        if replayed:
+            self._write_memory(self._memory)
+            logger.info(f"Replayed {replayed} memory events from {self.wal_path}")
+        
+        os.remove(self.wal_path)
+    
+    def _compact_memory(self) -> None:
+        """Write the in-memory copy to the snapshot file and reset the write-ahead log."""
+        with self.lock:
+            if not self._dirty_events:
+                return
             
-            # Initialize structures if needed
-            if date_str not in memory["days"]:
-                memory["days"][date_str] = {}
+            self._write_memory(self._memory)
+            self._wal.truncate(0)
+            self._dirty_events = 0
+    
+    def _persist_records(self, records: List[Dict[str, Any]]) -> None:
+        """
+        Apply a batch of event records and make them durable.
+        
+        Profile records are committed to the profile database in one
+        transaction; session records are appended to the day's session
+        history, counted in the memory statistics and logged to the
+        write-ahead log.
+        
+        Args:
+            records: Event records to persist
+        """
+        with self.lock:
+            logged = 0
+            self.db.execute("BEGIN")
+            try:
+                for record in records:
+                    if record["t"] != "profile":
+                        # Number logged records so replay can skip those already in the snapshot
+                        record = dict(record, seq=self._memory.get("wal_seq", 0) + 1)
+                    self._apply_record(record)
+                    if record["t"] != "profile":
+                        self._append_session_history(record["session"])
+                        self._wal.write(json.dumps(record, separators=(",", ":")) + "\n")
+                        logged += 1
+                self.db.execute("COMMIT")
+            except Exception:
+                self.db.execute("ROLLBACK")
+                raise
             
-            if str(hour) not in memory["days"][date_str]:
-                memory["days"][date_str][str(hour)] = {
-                    "sessions": []
-                }
+            if logged:
+                # Hand the batch to the OS so a crashed process loses nothing
+                self._wal.flush()
+                self._dirty_events += logged
+    
+    def _persist_loop(self) -> None:
+        """Drain queued memory events in batches and compact the snapshot on schedule."""
+        next_compaction = time.monotonic() + MEMORY_COMPACT_INTERVAL
+        stopping = False
+        
+        while not stopping:
+            try:
+                batch = [self._persist_q.get(timeout=max(0.0, next_compaction - time.monotonic()))]
+            except queue.Empty:
+                batch = []
             
-            # Add session data
-            memory["days"][date_str][str(hour)]["sessions"].append(session_data)
+            # Pick up whatever else is already waiting
+            while len(batch) < 100:
+                try:
+                    batch.append(self._persist_q.get_nowait())
+                except queue.Empty:
+                    break
             
-            # Update statistics
-            memory["statistics"]["total_sessions"] += 1
-            memory["statistics"]["total_profiles_scraped"] += session_data.get("profiles_completed", 0)
-            memory["statistics"]["total_profiles_failed"] += session_data.get("profiles_failed", 0)
+            # None is the shutdown sentinel
+            if None in batch:
+                stopping = True
+                batch = [record for record in batch if record is not None]
             
-            self._write_memory(memory)
+            try:
+                if batch:
+                    self._persist_records(batch)
+                
+                if (stopping or self._dirty_events >= MEMORY_COMPACT_EVENTS
+                        or time.monotonic() >= next_compaction):
+                    self._compact_memory()
+                    next_compaction = time.monotonic() + MEMORY_COMPACT_INTERVAL
+            except Exception:
+                logger.exception("Failed to persist memory")
+    
+    def close(self) -> None:
+        """Flush queued memory events, write a final snapshot and close the write-ahead log."""
+        if self._wal.closed:
+            return
+        
+        self._persist_q.put(None)
+        self._persist_thread.join(timeout=5.0)
+        
+        if self._persist_thread.is_alive():
+            logger.warning("Memory persistence thread did not finish; leaving the write-ahead log open")
+            return
+        
+        self._wal.close()
+        self.db.close()
+    
+    def _apply_session(self, memory: Dict[str, Any], session_data: Dict[str, Any]) -> None:
+        """
+        Count a session in the statistics of a memory structure.
+        
+        The session itself is kept in the daily session history.
+        
+        Args:
+            memory: Memory data to update
+            session_data: Session data to record
+        """
+        # Update statistics
+        memory["statistics"]["total_sessions"] += 1
+        memory["statistics"]["total_profiles_scraped"] += session_data.get("profiles_completed", 0)
+        memory["statistics"]["total_profiles_failed"] += session_data.get("profiles_failed", 0)
+    
+    def _upsert_profile(self, profile_url: str, status: str, metadata: Dict[str, Any], timestamp: str) -> None:
+        """
+        Record a profile status in the profile database.
+        
+        Args:
+            profile_url: Profile URL
+            status: Profile status
+            metadata: Additional metadata
+            timestamp: ISO timestamp of the status change
+        """
+        self.db.execute(
+            "INSERT INTO profiles(url, first_seen, last_updated, last_status) VALUES(?, ?, ?, ?) "
+            "ON CONFLICT(url) DO UPDATE SET last_updated=excluded.last_updated, last_status=excluded.last_status",
+            (profile_url, timestamp, timestamp, status)
+        )
+        self.db.execute(
+            "INSERT INTO profile_history(url, ts, status, meta) VALUES(?, ?, ?, ?)",
+            (profile_url, timestamp, status, json.dumps(metadata))
+        )
+    
+    def _index_session(self, session_data: Dict[str, Any]) -> None:
+        """
+        Count a session in the per-hour session index.
+        
+        Args:
+            session_data: Session data to index
+        """
+        session_time = datetime.fromisoformat(session_data["start_time"])
+        key = (session_time.date().isoformat(), session_time.hour)
+        self._session_counts[key] = self._session_counts.get(key, 0) + 1
+        if "end_time_epoch" in session_data:
+            self._last_session_end[key] = session_data["end_time_epoch"]
+        elif "end_time" in session_data:
+            # Sessions recorded before end_time_epoch existed
+            self._last_session_end[key] = datetime.fromisoformat(session_data["end_time"]).timestamp()
     
-    def _update_memory_with_profile(self, profile_url: str, status: str, metadata: Dict[str, Any]) -> None:
+    def _update_memory_with_session(self, session_data: Dict[str, Any]) -> None:
+        """
+        Update memory with session data.
+        
+        Args:
+            session_data: Session data to record
+        """
+        self._persist_q.put_nowait({"t": "session", "session": session_data})
+    
+    def _update_memory_with_profile(self, profile_url: str, status: str, metadata: Dict[str, Any],
+                                    timestamp: Optional[str] = None) -> None:
         """
         Update memory with profile data.
         
@@ -245,36 +681,10 @@ class Brain:
             profile_url: Profile URL
             status: Profile status
             metadata: Additional metadata
+            timestamp: ISO timestamp of the status change (defaults to now)
         """
-        with self.lock:
-            memory = self._read_memory()
-            
-            # Initialize if needed
-            if "profiles" not in memory:
-                memory["profiles"] = {}
-            
-            # Add or update profile data
-            if profile_url in memory["profiles"]:
-                memory["profiles"][profile_url]["history"].append({
-                    "timestamp": datetime.now().isoformat(),
-                    "status": status,
-                    "metadata": metadata
-                })
-                memory["profiles"][profile_url]["last_status"] = status
-                memory["profiles"][profile_url]["last_updated"] = datetime.now().isoformat()
-            else:
-                memory["profiles"][profile_url] = {
-                    "first_seen": datetime.now().isoformat(),
-                    "last_updated": datetime.now().isoformat(),
-                    "last_status": status,
-                    "history": [{
-                        "timestamp": datetime.now().isoformat(),
-                        "status": status,
-                        "metadata": metadata
-                    }]
-                }
-            
-            self._write_memory(memory)
+        self._persist_q.put_nowait({"t": "profile", "url": profile_url, "status": status,
+                                    "meta": metadata, "ts": timestamp or datetime.now().isoformat()})
     
     def start(self) -> bool:
         """
@@ -308,13 +718,14 @@ class Brain:
         
         logger.info("Stopping Brain...")
         self.running = False
+        self._wake.set()
         
         if self.thread:
             self.thread.join(timeout=5.0)
         
         # Reset state to inactive
-        if self.state_machine.get_current_state() != STATES["INACTIVE"]:
-            self.state_machine.transition(STATES["INACTIVE"], "Brain stopped")
+        if self.state_machine.get_current_state() != STATES.INACTIVE:
+            self._transition(STATES.INACTIVE, "Brain stopped")
         
         logger.info("Brain stopped")
         return True
@@ -324,109 +735,106 @@ class Brain:
         try:
             while self.running:
                 try:
+                    # Clear before reading the state so a transition made from
+                    # another thread while we wait below is never missed
+                    self._wake.clear()
                     current_state = self.state_machine.get_current_state()
                     
-                    if current_state == STATES["WAITING_FOR_ACTIVE_HOURS"]:
-                        self._handle_waiting_for_active_hours()
-                    elif current_state == STATES["PLANNING_NEXT_SESSION"]:
-                        self._handle_planning_next_session()
-                    elif current_state == STATES["COOLDOWN_PERIOD"]:
-                        self._handle_cooldown_period()
-                    elif current_state == STATES["ERROR"]:
-                        self._handle_error_state()
-                    elif current_state == STATES["SESSION_STARTING"]:
-                        # Check if it's time to start the session
-                        state_data = self.state_machine.get_state_data()
-                        session_plan = state_data.get("session_plan", {})
-                        
-                        if session_plan:
-                            planned_start_time = datetime.fromisoformat(session_plan.get("planned_start_time", ""))
-                            
-                            if datetime.now() >= planned_start_time:
-                                # Start the session
-                                logger.info(f"Starting planned session {session_plan['id']}")
-                                self.session_started(session_plan['id'])
-                                
-                                # Transition to FEED_BROWSING state
-                                self.state_machine.transition(
-                                    STATES["FEED_BROWSING"],
-                                    f"Starting session {session_plan['id']}",
-                                    {"session_id": session_plan['id']}
-                                )
-                    elif current_state == STATES["FEED_BROWSING"] or current_state == STATES["PROFILE_SCRAPING"]:
-                        # Check if we should end the session due to duration
-                        if self.check_session_duration():
-                            logger.info("Session duration limit reached, transitioning to SESSION_ENDING")
-                            self.state_machine.transition(
-                                STATES["SESSION_ENDING"],
-                                "Session duration limit reached",
-                                {"session_id": self.current_session["id"] if self.current_session else None}
-                            )
-                    
-                    # Short sleep to prevent CPU hogging
-                    time.sleep(1)
+                    handler = self._state_dispatch.get(current_state)
+                    if handler:
+                        handler()
+                    else:
+                        # Nothing scheduled in this state; wait for the next transition
+                        self._wake.wait(60)
                     
                 except Exception as e:
-                    logger.error(f"Error in Brain main loop: {str(e)}")
-                    logger.error(traceback.format_exc())
+                    tb = traceback.format_exc()
+                    logger.error("Error in Brain main loop: %s\n%s", e, tb)
                     
                     # Transition to error state
-                    self.state_machine.transition(
-                        STATES["ERROR"],
+                    self._transition(
+                        STATES.ERROR,
                         f"Error in main loop: {str(e)}",
-                        {"error": str(e), "traceback": traceback.format_exc()}
+                        {"error": str(e), "traceback": tb}
                     )
                     
                     # Safety sleep to prevent error loops
                     time.sleep(10)
         except Exception as e:
-            logger.critical(f"Fatal error in Brain: {str(e)}")
-            logger.critical(traceback.format_exc())
+            logger.critical("Fatal error in Brain: %s", e, exc_info=True)
             self.running = False
     
+    def _handle_session_starting(self) -> None:
+        """Handle the SESSION_STARTING state."""
+        # Check if it's time to start the session
+        state_data = self.state_machine.get_state_data()
+        session_plan = state_data.get("session_plan", {})
+        
+        if not session_plan:
+            self._wake.wait(60)
+            return
+        
+        wait_seconds = session_plan["planned_start_monotonic"] - time.monotonic()
+        if wait_seconds > 0:
+            # Sleep until the planned start
+            self._wake.wait(wait_seconds)
+            return
+        
+        # Start the session
+        logger.info("Starting planned session %s", session_plan['id'])
+        self.session_started(session_plan['id'])
+        
+        # Transition to FEED_BROWSING state
+        self._transition(
+            STATES.FEED_BROWSING,
+            f"Starting session {session_plan['id']}",
+            {"session_id": session_plan['id']}
+        )
+    
+    def _handle_session_active(self) -> None:
+        """Handle the FEED_BROWSING and PROFILE_SCRAPING states."""
+        # Check if we should end the session due to duration
+        if self.check_session_duration():
+            logger.info("Session duration limit reached, transitioning to SESSION_ENDING")
+            session = self.current_session
+            self._transition(
+                STATES.SESSION_ENDING,
+                "Session duration limit reached",
+                {"session_id": session["id"] if session else None}
+            )
+        else:
+            self._wake.wait(self._session_check_delay())
+    
     def _handle_waiting_for_active_hours(self) -> None:
         """Handle the WAITING_FOR_ACTIVE_HOURS state."""
-        current_hour = datetime.now().hour
+        now = datetime.now()
+        current_hour = now.hour
         
         if current_hour in ACTIVE_HOURS:
             # We're in active hours, start planning
-            self.state_machine.transition(
-                STATES["PLANNING_NEXT_SESSION"],
+            self._transition(
+                STATES.PLANNING_NEXT_SESSION,
                 f"Entered active hours (current hour: {current_hour})"
             )
         else:
             # Calculate time until next active hour
-            now = datetime.now()
-            next_active_hour = None
-            
-            for hour in sorted(ACTIVE_HOURS):
-                if hour > current_hour:
-                    next_active_hour = hour
-                    break
-            
-            if next_active_hour is None:
-                # No more active hours today, wait until tomorrow
-                next_active_hour = min(ACTIVE_HOURS)
-                next_time = now.replace(hour=next_active_hour, minute=0, second=0, microsecond=0) + timedelta(days=1)
-            else:
-                next_time = now.replace(hour=next_active_hour, minute=0, second=0, microsecond=0)
-            
+            next_time = self._next_active_time(now)
             wait_seconds = (next_time - now).total_seconds()
             
-            logger.info(f"Outside active hours. Waiting until {next_time.strftime('%H:%M:%S')} "
-                       f"({wait_seconds/60:.1f} minutes)")
+            logger.info("Outside active hours. Waiting until %s (%.1f minutes)",
+                        next_time.strftime('%H:%M:%S'), wait_seconds / 60)
             
-            # Long sleep to prevent frequent checks
-            time.sleep(min(wait_seconds, 300))  # Sleep at most 5 minutes
+            # Sleep until the next active hour unless something changes first
+            self._wake.wait(wait_seconds)
     
     def _handle_planning_next_session(self) -> None:
         """Handle the PLANNING_NEXT_SESSION state."""
         # Check if we have pending profiles
-        queue_stats = self.queue_manager.get_queue_stats()
+        queue_stats = self._get_queue_stats()
         if queue_stats["pending"] == 0:
             # No profiles to process, go back to waiting
-            self.state_machine.transition(
-                STATES["WAITING_FOR_ACTIVE_HOURS"],
+            self._transition(
+                STATES.WAITING_FOR_ACTIVE_HOURS,
                 "No pending profiles in queue"
             )
             return
@@ -447,8 +855,8 @@ class Brain:
         
         if not profiles:
             # This shouldn't happen based on our earlier check, but just in case
-            self.state_machine.transition(
-                STATES["WAITING_FOR_ACTIVE_HOURS"],
+            self._transition(
+                STATES.WAITING_FOR_ACTIVE_HOURS,
                 "Failed to get profiles for session"
             )
             return
@@ -458,31 +866,30 @@ class Brain:
             "id": f"session_{int(time.time())}",
             "type": session_type["name"],
             "planned_start_time": next_session_time.isoformat(),
+            "planned_start_monotonic": time.monotonic() + (next_session_time - datetime.now()).total_seconds(),
             "planned_duration": session_duration,
             "max_profiles": max_profiles,
             "profiles": profiles
         }
         
         # Store the plan
-        self.next_sessions.append(session_plan)
+        self._next_by_id[session_plan["id"]] = session_plan
+        heapq.heappush(self._next_heap, (session_plan["planned_start_monotonic"], session_plan["id"]))
         
         # Publish session planned event
-        self.event_bus.publish(EVENTS["SESSION_PLANNED"], session_plan)
+        self.event_bus.publish_fast(self._h_session_planned, session_plan)
         
-        logger.info(f"Planned {session_type['name']} session for {next_session_time.strftime('%H:%M:%S')}: "
-                   f"{len(profiles)} profiles, {session_duration/60:.1f} minutes duration")
+        logger.info("Planned %s session for %s: %d profiles, %.1f minutes duration",
+                    session_type['name'], next_session_time.strftime('%H:%M:%S'),
+                    len(profiles), session_duration / 60)
         
         # Update state data
-        self.state_machine.transition(
-            STATES["SESSION_STARTING"],
+        self._transition(
+            STATES.SESSION_STARTING,
             f"Session planned for {next_session_time.strftime('%H:%M:%S')}",
             {"session_plan": session_plan}
         )
-        
-        # Wait until the session should start
-        wait_seconds = (next_session_time - datetime.now()).total_seconds()
-        if wait_seconds > 0:
-            time.sleep(wait_seconds)
+
     
     def _handle_cooldown_period(self) -> None:
         """Handle the COOLDOWN_PERIOD state."""
@@ -490,37 +897,42 @@ class Brain:
         current_hour = datetime.now().hour
         if current_hour not in ACTIVE_HOURS:
             # Outside active hours, transition to waiting
-            self.state_machine.transition(
-                STATES["WAITING_FOR_ACTIVE_HOURS"],
+            self._transition(
+                STATES.WAITING_FOR_ACTIVE_HOURS,
                 f"Cooldown ended outside active hours (current hour: {current_hour})"
             )
             return
         
         # Get cooldown duration from state data
         state_data = self.state_machine.get_state_data()
-        cooldown_end = datetime.fromisoformat(state_data.get("cooldown_end", datetime.now().isoformat()))
+        wait_seconds = state_data.get("cooldown_end_monotonic", 0.0) - time.monotonic()
         
-        if datetime.now() >= cooldown_end:
+        if wait_seconds <= 0:
             # Cooldown period finished, plan next session
-            self.state_machine.transition(
-                STATES["PLANNING_NEXT_SESSION"],
+            self._transition(
+                STATES.PLANNING_NEXT_SESSION,
                 "Cooldown period ended"
             )
         else:
             # Still in cooldown, wait a bit
-            wait_seconds = (cooldown_end - datetime.now()).total_seconds()
-            logger.info(f"In cooldown period. {wait_seconds/60:.1f} minutes remaining.")
-            time.sleep(min(wait_seconds, 60))  # Wait at most 1 minute
+            # Log at most once a minute however often the loop is woken
+            now = time.monotonic()
+            if now - self._last_cooldown_log >= 60:
+                self._last_cooldown_log = now
+                logger.info("In cooldown period. %.1f minutes remaining.", wait_seconds / 60)
+            self._wake.wait(wait_seconds)
     
     def _handle_error_state(self) -> None:
         """Handle the ERROR state."""
         # Simple recovery: wait a bit and try to restart
         logger.info("In error state. Attempting recovery...")
-        time.sleep(30)  # Wait 30 seconds
+        self._wake.wait(30)  # Wait 30 seconds
+        if not self.running:
+            return
         
         # Try to restart by going back to planning
-        self.state_machine.transition(
-            STATES["WAITING_FOR_ACTIVE_HOURS"],
+        self._transition(
+            STATES.WAITING_FOR_ACTIVE_HOURS,
             "Recovering from error state"
         )
     
@@ -535,12 +947,8 @@ class Brain:
         current_hour = now.hour
         
         # Check how many sessions we've already had in this hour
-        memory = self._read_memory()
-        date_str = now.date().isoformat()
-        
-        sessions_this_hour = 0
-        if date_str in memory["days"] and str(current_hour) in memory["days"][date_str]:
-            sessions_this_hour = len(memory["days"][date_str][str(current_hour)]["sessions"])
+        hour_key = (now.date().isoformat(), current_hour)
+        sessions_this_hour = self._session_counts.get(hour_key, 0)
         
         # Determine how many sessions we should have in this hour
         if current_hour == self.three_session_hour:
@@ -551,25 +959,8 @@ class Brain:
             target_sessions = SESSIONS_PER_HOUR
         
         if sessions_this_hour >= target_sessions:
-            # We've reached our session limit for this hour, plan for next hour
-            next_hour = current_hour + 1
-            if next_hour not in ACTIVE_HOURS:
-                # Find next active hour
-                next_active_hour = None
-                for hour in sorted(ACTIVE_HOURS):
-                    if hour > current_hour:
-                        next_active_hour = hour
-                        break
-                
-                if next_active_hour is None:
-                    # No more active hours today, use first hour tomorrow
-                    next_active_hour = min(ACTIVE_HOURS)
-                    next_time = now.replace(hour=next_active_hour, minute=0, second=0, microsecond=0) + timedelta(days=1)
-                else:
-                    next_time = now.replace(hour=next_active_hour, minute=0, second=0, microsecond=0)
-            else:
-                # Plan for next hour
-                next_time = now.replace(hour=next_hour, minute=0, second=0, microsecond=0)
+            # We've reached our session limit for this hour, plan for the next active hour
+            next_time = self._next_active_time(now)
             
             # Add random offset in first 15 minutes
             random_offset = random.randint(1, 15 * 60)
@@ -577,21 +968,13 @@ class Brain:
         else:
             # We can still have a session this hour
             # Check when the last session ended
-            last_session_end = None
-            if self.current_session and "end_time" in self.current_session:
-                last_session_end = datetime.fromisoformat(self.current_session["end_time"])
-            elif date_str in memory["days"] and str(current_hour) in memory["days"][date_str]:
-                hour_sessions = memory["days"][date_str][str(current_hour)]["sessions"]
-                if hour_sessions:
-                    last_session = hour_sessions[-1]
-                    if "end_time" in last_session:
-                        last_session_end = datetime.fromisoformat(last_session["end_time"])
+            last_session_end = self._last_session_end.get(hour_key)
             
             if last_session_end:
                 # Ensure minimum spacing between sessions
-                minimum_next_time = last_session_end + timedelta(seconds=MINIMUM_SESSION_SPACING)
-                if minimum_next_time > now:
-                    next_time = minimum_next_time
+                minimum_next_epoch = last_session_end + MINIMUM_SESSION_SPACING
+                if minimum_next_epoch > time.time():
+                    next_time = datetime.fromtimestamp(minimum_next_epoch)
                 else:
                     # We can start soon, add a small random delay
                     next_time = now + timedelta(seconds=random.randint(30, 300))  # 30 sec to 5 min
@@ -608,16 +991,7 @@ class Brain:
         Returns:
             Selected session type
         """
-        rand = random.random()
-        cumulative_prob = 0
-        
-        for session_type in SESSION_TYPES:
-            cumulative_prob += session_type["probability"]
-            if rand <= cumulative_prob:
-                return session_type
-        
-        # Default to first session type if something goes wrong
-        return SESSION_TYPES[0]
+        return pick_session_type()
     
     def check_session_duration(self) -> bool:
         """
@@ -626,23 +1000,24 @@ class Brain:
         Returns:
             True if the session should terminate after the current profile, False otherwise
         """
-        if not self.current_session:
+        session = self.current_session
+        if not session:
             return False
             
         # Get planned and actual durations
-        planned_duration = self.current_session.get("planned_duration", 0)
-        start_time = datetime.fromisoformat(self.current_session["start_time"])
-        actual_duration = (datetime.now() - start_time).total_seconds()
+        planned_duration = session.get("planned_duration", 0)
+        actual_duration = time.monotonic() - session["start_monotonic"]
         
         # Check if we've exceeded planned duration
         if actual_duration > planned_duration + self.session_overtime_allowed:
             if not self.profile_in_progress:
                 # No profile in progress, can terminate immediately
-                logger.info(f"Session duration exceeded ({actual_duration:.1f}s > {planned_duration:.1f}s), terminating")
+                logger.info("Session duration exceeded (%.1fs > %.1fs), terminating",
+                            actual_duration, planned_duration)
                 return True
             elif not self.should_terminate_session:
                 # Profile in progress, mark for termination after completion
-                logger.info(f"Session duration exceeded but profile in progress. Will terminate after completion.")
+                logger.info("Session duration exceeded but profile in progress. Will terminate after completion.")
                 self.should_terminate_session = True
                 # Allow extra time for current profile to complete
                 self.session_overtime_allowed = 300  # 5 minutes grace period
@@ -650,6 +1025,22 @@ class Brain:
         
         return self.should_terminate_session and not self.profile_in_progress
 
+    def _session_check_delay(self) -> float:
+        """
+        Get how long the main loop can sleep before the session duration needs checking again.
+        
+        Returns:
+            Seconds until the current session reaches its allowed duration
+        """
+        session = self.current_session
+        if not session or self.should_terminate_session:
+            # Nothing to time, or waiting for the profile in progress to complete
+            return 60
+        
+        elapsed = time.monotonic() - session["start_monotonic"]
+        remaining = session.get("planned_duration", 0) + self.session_overtime_allowed - elapsed
+        return min(max(remaining, 1), 60)
+    
     def mark_profile_started(self) -> None:
         """Mark that a profile scraping operation has started."""
         self.profile_in_progress = True
@@ -659,13 +1050,33 @@ class Brain:
         """Mark that a profile scraping operation has completed."""
         self.profile_in_progress = False
         logger.debug("Profile scraping completed")
+        self._wake.set()
         
         # Check if we should terminate the session
         if self.should_terminate_session:
             logger.info("Profile completed and session marked for termination. Ending session now.")
-            if self.current_session:
-                self.event_bus.publish(EVENTS["SESSION_ENDED"], self.current_session)
+            session = self.current_session
+            if session:
+                self.event_bus.publish_fast(self._h_session_ended, session)
 
+    @property
+    def next_sessions(self) -> List[Dict[str, Any]]:
+        """Planned sessions that have not started yet, earliest first."""
+        return [self._next_by_id[session_id] for _, session_id in sorted(self._next_heap)
+                if session_id in self._next_by_id]
+    
+    def set_session_sink(self, callback: Optional[Callable[[Dict[str, Any]], None]]) -> None:
+        """
+        Register the single consumer of started sessions.
+        
+        When set, session_started calls it directly instead of publishing
+        SESSION_STARTED on the EventBus.
+        
+        Args:
+            callback: Function receiving the session data, or None to publish events again
+        """
+        self._session_sink = callback
+    
     def session_started(self, session_id: str) -> None:
         """
         Notify the Brain that a session has started.
@@ -673,37 +1084,41 @@ class Brain:
         Args:
             session_id: ID of the started session
         """
-        # Find the session plan
-        session_plan = None
-        for plan in self.next_sessions:
-            if plan["id"] == session_id:
-                session_plan = plan
-                break
+        # Find and remove the session plan
+        session_plan = self._next_by_id.pop(session_id, None)
         
         if not session_plan:
             logger.error(f"Session {session_id} not found in planned sessions")
             return
         
-        # Remove from next sessions
-        self.next_sessions = [s for s in self.next_sessions if s["id"] != session_id]
+        # Drop heap entries of plans that are no longer pending
+        while self._next_heap and self._next_heap[0][1] not in self._next_by_id:
+            heapq.heappop(self._next_heap)
         
         # Create current session tracking
-        self.current_session = {
+        session = {
             **session_plan,
             "start_time": datetime.now().isoformat(),
+            "start_monotonic": time.monotonic(),
             "profiles_started": 0,
             "profiles_completed": 0,
             "profiles_failed": 0
         }
+        with self._session_lock:
+            self.current_session = session
         
         # Reset session termination flags
         self.profile_in_progress = False
         self.should_terminate_session = False
         self.session_overtime_allowed = 0
         
-        # Publish event
-        logger.info(f"Publishing SESSION_STARTED event for session {session_id}")
-        self.event_bus.publish(EVENTS["SESSION_STARTED"], self.current_session)
+        # Hand the session straight to the registered sink, or publish it
+        if self._session_sink:
+            logger.info(f"Handing session {session_id} to the session sink")
+            self._session_sink(session)
+        else:
+            logger.info(f"Publishing SESSION_STARTED event for session {session_id}")
+            self.event_bus.publish_fast(self._h_session_started, session)
         
         logger.info(f"Session {session_id} started")
     
@@ -715,42 +1130,51 @@ class Brain:
             session_id: ID of the ended session
             stats: Statistics about the session
         """
-        if not self.current_session or self.current_session["id"] != session_id:
-            logger.error(f"Session {session_id} not found in current session")
-            return
-        
-        # Update session record
-        self.current_session.update({
-            "end_time": datetime.now().isoformat(),
-            "actual_duration": (datetime.now() - datetime.fromisoformat(self.current_session["start_time"])).total_seconds(),
-            **stats
-        })
+        with self._session_lock:
+            session = self.current_session
+            if not session or session["id"] != session_id:
+                logger.error(f"Session {session_id} not found in current session")
+                return
+            
+            now = datetime.now()
+            
+            # Build the final session record
+            completed_session = {
+                **session,
+                "end_time": now.isoformat(),
+                "end_time_epoch": now.timestamp(),
+                "actual_duration": (now - datetime.fromisoformat(session["start_time"])).total_seconds(),
+                **stats
+            }
+            self.current_session = None
         
         # Record in memory
-        self._update_memory_with_session(self.current_session)
+        self._index_session(completed_session)
+        self._update_memory_with_session(completed_session)
         
         # Publish event
-        self.event_bus.publish(EVENTS["SESSION_ENDED"], self.current_session)
+        self.event_bus.publish_fast(self._h_session_ended, completed_session)
+        
+        # A session the worker finished before the duration limit is still active
+        if self.state_machine.get_current_state() in (STATES.FEED_BROWSING, STATES.PROFILE_SCRAPING):
+            self._transition(STATES.SESSION_ENDING, "Session finished", {"session_id": session_id})
         
         # Calculate cooldown period
         cooldown_minutes = random.randint(10, 30)
-        cooldown_end = datetime.now() + timedelta(minutes=cooldown_minutes)
+        cooldown_end = now + timedelta(minutes=cooldown_minutes)
         
         # Transition to cooldown
-        self.state_machine.transition(
-            STATES["COOLDOWN_PERIOD"],
+        self._transition(
+            STATES.COOLDOWN_PERIOD,
             f"Session ended, cooldown for {cooldown_minutes} minutes",
             {
-                "session": self.current_session,
+                "session": completed_session,
                 "cooldown_minutes": cooldown_minutes,
-                "cooldown_end": cooldown_end.isoformat()
+                "cooldown_end": cooldown_end.isoformat(),
+                "cooldown_end_monotonic": time.monotonic() + cooldown_minutes * 60
             }
         )
         
-        # Clear current session
-        completed_session = self.current_session
-        self.current_session = None
-        
         # Reset profile progress tracking
         self.profile_in_progress = False
         self.should_terminate_session = False
@@ -771,7 +1195,7 @@ class Brain:
             "state_data": self.state_machine.get_state_data(),
             "current_session": self.current_session,
             "next_sessions": self.next_sessions,
-            "queue_stats": self.queue_manager.get_queue_stats(),
+            "queue_stats": self._get_queue_stats(),
             "special_hours": {
                 "three_session_hour": self.three_session_hour,
                 "one_session_hours": self.one_session_hours
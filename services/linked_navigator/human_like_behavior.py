@@ -7,23 +7,142 @@ for browsing LinkedIn, including natural scrolling, mouse movements,
 timing variations, and session behavior.
 """
 
+import functools
 import logging
 import random
 import time
-from datetime import datetime, timedelta
-from typing import List, Dict, Any, Optional, Tuple, Callable
-import threading
+from typing import List, Dict, Any, Optional, Tuple
 
 from config.scraper_config import (
     LINKEDIN_FEED_URL, FEED_BROWSING_DURATION, SCROLL_PAUSE_TIME,
-    PROFILE_NAVIGATION_DELAY, EVENTS, STATES
+    PROFILE_NAVIGATION_DELAY, EVENTS, section_read_time
 )
 from utils.event_bus import EventBus
-from utils.state_machine import StateMachine
 from utils.playwright_driver import PlaywrightDriver
 
 logger = logging.getLogger(__name__)
 
+_EVENT_BUS = EventBus.get_instance()
+
+# Scroll, mouse, hover and reading calls. The helpers they share are defined
+# inside each evaluated function instead of being installed on the page, so
+# nothing is left on window for page scripts to enumerate.
+_MOVE_MOUSE_JS = """
+        // Dispatch a synthetic mousemove at the given client coordinates
+        const moveMouse = (x, y) => {
+            const event = new MouseEvent('mousemove', {
+                'view': window,
+                'bubbles': true,
+                'cancelable': true,
+                'clientX': x,
+                'clientY': y
+            });
+            document.dispatchEvent(event);
+        };
+"""
+
+_MOUSE_PATH_JS = """
+        // Move the mouse to (targetX, targetY) along a bezier curve of the given number of segments
+        const humanMouseMove = (targetX, targetY, points) => {
+            const currentX = targetX / 2; // Start roughly in the center
+            const currentY = targetY / 2;
+            
+            // Add control points for the bezier curve
+            const cp1x = currentX + (Math.random() * 100) - 50;
+            const cp1y = currentY + (Math.random() * 100) - 50;
+            const cp2x = targetX - (Math.random() * 100) - 50;
+            const cp2y = targetY - (Math.random() * 100) - 50;
+            
+            // Generate points along the bezier curve
+            const bezierPoints = [];
+            for (let i = 0; i <= points; i++) {
+                const t = i / points;
+                const u = 1 - t;
+                
+                // Cubic bezier formula
+                const x = (u*u*u * currentX) + (3 * u*u * t * cp1x) + (3 * u * t*t * cp2x) + (t*t*t * targetX);
+                const y = (u*u*u * currentY) + (3 * u*u * t * cp1y) + (3 * u * t*t * cp2y) + (t*t*t * targetY);
+                bezierPoints.push({ x, y });
+            }
+            
+            // Move the mouse along the curve with varying speed
+            (async () => {
+                for (const point of bezierPoints) {
+                    moveMouse(point.x, point.y);
+                    await new Promise(r => setTimeout(r, 10 + Math.random() * 30));
+                }
+            })();
+        };
+"""
+
+# Smoothly scroll down by arg.distance pixels; the call resolves once the
+# scroll is done, so consecutive scrolls never interleave their scrollBy steps
+_SCROLL_CALL = """
+    async (arg) => {
+        const steps = Math.floor(10 + Math.random() * 15); // 10-25 steps
+        const delay = Math.floor(5 + Math.random() * 10); // 5-15ms between steps
+        const stepSize = arg.distance / steps;
+        for (let i = 0; i < steps; i++) {
+            window.scrollBy(0, stepSize);
+            await new Promise(r => setTimeout(r, delay));
+        }
+        return true;
+    }
+"""
+
+# Move the mouse to (arg.x, arg.y) without waiting for the movement to finish
+_MOUSE_CALL = "(arg) => {" + _MOVE_MOUSE_JS + _MOUSE_PATH_JS + """
+        humanMouseMove(arg.x, arg.y, arg.points);
+        return true;
+    }
+"""
+
+# Move the mouse onto the centre of an element; false if it isn't on the page
+_HOVER_CALL = "(selector) => {" + _MOVE_MOUSE_JS + """
+        const el = document.querySelector(selector);
+        if (!el) return false;
+        
+        const rect = el.getBoundingClientRect();
+        moveMouse(rect.left + rect.width / 2, rect.top + rect.height / 2);
+        return true;
+    }
+"""
+
+# Play a reading plan: each step may scroll, move the mouse, then pause
+_READ_CALL = "async (plan) => {" + _MOVE_MOUSE_JS + _MOUSE_PATH_JS + """
+        for (const step of plan) {
+            if (step.scroll) window.scrollBy(0, step.scroll);
+            if (step.x !== undefined) humanMouseMove(step.x, step.y, step.points);
+            if (step.sleep) await new Promise(r => setTimeout(r, step.sleep * 1000));
+        }
+        return true;
+    }
+"""
+
+# Size of the visible page area, for pages without a fixed viewport
+_VIEWPORT_JS = """
+    () => {
+        return {
+            width: document.documentElement.clientWidth,
+            height: document.documentElement.clientHeight
+        };
+    }
+"""
+
+@functools.lru_cache(maxsize=1024)
+def _section_url(profile_url: str, section: str) -> str:
+    """
+    Build the details URL for a profile section.
+    
+    Args:
+        profile_url: Base profile URL, with or without a trailing slash
+        section: Section name (e.g., 'experience', 'education')
+        
+    Returns:
+        Full URL for the section
+    """
+    return f"{profile_url.rstrip('/')}/details/{section}/"
+
 class HumanLikeBehavior:
     """
     Implements human-like browsing behaviors for LinkedIn interaction.
@@ -40,13 +159,15 @@ class HumanLikeBehavior:
             driver: Optional PlaywrightDriver instance
         """
         self.driver = driver
-        self.event_bus = EventBus.get_instance()
-        self.state_machine = StateMachine()  # Using shared state machine
+        self.event_bus = _EVENT_BUS
         
         # Last interaction tracking
         self.last_scroll_time = None
         self.last_click_time = None
         self.last_mouse_move_time = None
+        
+        # Viewport dimensions, cached until the next navigation
+        self._viewport = None
     
     def set_driver(self, driver: PlaywrightDriver) -> None:
         """
@@ -56,6 +177,23 @@ class HumanLikeBehavior:
             driver: PlaywrightDriver instance
         """
         self.driver = driver
+        self._viewport = None
+    
+    def _get_viewport(self) -> Dict[str, int]:
+        """
+        Get the page dimensions, asking the browser only when they aren't cached.
+        
+        Returns:
+            Dictionary with width and height
+        """
+        if self._viewport is None:
+            viewport = self.driver.get_viewport_size() or self.driver.evaluate(_VIEWPORT_JS)
+            if not viewport:
+                logger.warning("Could not get page dimensions, using defaults")
+                return {"width": 1366, "height": 768}
+            self._viewport = viewport
+        
+        return self._viewport
     
     def browse_feed(self, min_duration: Optional[float] = None, max_duration: Optional[float] = None) -> bool:
         """
@@ -78,17 +216,15 @@ class HumanLikeBehavior:
         duration = random.uniform(min_duration, max_duration)
         
         try:
-            # Transition state
-            self.state_machine.transition(STATES["FEED_BROWSING"], "Starting feed browsing")
-            
             # Navigate to feed
-            logger.info(f"Navigating to LinkedIn feed for {duration:.1f} seconds browsing")
-            if not self.driver.navigate(LINKEDIN_FEED_URL, wait_until="domcontentloaded"):
+            logger.info("Navigating to LinkedIn feed for %.1f seconds browsing", duration)
+            if not self.driver.navigate(LINKEDIN_FEED_URL, wait_until="commit"):
                 logger.error("Failed to navigate to LinkedIn feed")
                 return False
+            self._viewport = None
             
-            # Randomized delay for page to render basic content (1.0 to 3.4 seconds with millisecond precision)
-            time.sleep(1.0 + random.random() * 2.4)
+            # Wait until at least the main content has loaded
+            self.driver.wait_until_ready()
             
             # Scroll feed for specified duration
             self._scroll_with_human_behavior(duration=duration)
@@ -97,7 +233,7 @@ class HumanLikeBehavior:
             return True
             
         except Exception as e:
-            logger.error(f"Error browsing feed: {str(e)}")
+            logger.error("Error browsing feed: %s", e)
             return False
     
     def navigate_to_profile(self, profile_url: str) -> bool:
@@ -117,28 +253,28 @@ class HumanLikeBehavior:
         try:
             # Add natural delay before navigating
             delay = random.uniform(*PROFILE_NAVIGATION_DELAY)
-            logger.info(f"Waiting {delay:.1f} seconds before navigating to profile")
-            time.sleep(delay)
+            logger.info("Waiting %.1f seconds before navigating to profile", delay)
             
-            # Transition state
-            self.state_machine.transition(
-                STATES["PROFILE_SCRAPING"],
-                f"Navigating to profile {profile_url}"
-            )
+            # Callers browse the feed before getting here, so the profile can start
+            # loading in a background tab during the delay; navigate() adopts it
+            wait_started = time.monotonic()
+            self.driver.prefetch(profile_url, timeout=delay)
+            time.sleep(max(0.0, delay - (time.monotonic() - wait_started)))
             
             # Navigate to profile
-            logger.info(f"Navigating to profile: {profile_url}")
-            if not self.driver.navigate(profile_url, wait_until="domcontentloaded"):
-                logger.error(f"Failed to navigate to profile: {profile_url}")
+            logger.info("Navigating to profile: %s", profile_url)
+            if not self.driver.navigate(profile_url, wait_until="commit"):
+                logger.error("Failed to navigate to profile: %s", profile_url)
                 return False
+            self._viewport = None
             
-            # Short delay to ensure at least some content has loaded
-            time.sleep(2)
+            # Wait until at least the main content has loaded
+            self.driver.wait_until_ready()
             
             # Verify we're on the right profile page
-            current_url = self.driver.evaluate("() => window.location.href")
+            current_url = self.driver.get_current_url()
             if profile_url not in current_url:
-                logger.warning(f"Expected to be on {profile_url} but current URL is {current_url}")
+                logger.warning("Expected to be on %s but current URL is %s", profile_url, current_url)
             
             # Sometimes scroll profile with pauses
             if random.random() < 0.8:  # 80% chance
@@ -147,7 +283,7 @@ class HumanLikeBehavior:
             return True
             
         except Exception as e:
-            logger.error(f"Error navigating to profile: {str(e)}")
+            logger.error("Error navigating to profile: %s", e)
             return False
 
     def navigate_to_profile_section(self, profile_url: str, section: str) -> bool:
@@ -167,37 +303,38 @@ class HumanLikeBehavior:
         
         try:
             # Build section URL
-            section_url = f"{profile_url}/details/{section}/"
+            section_url = _section_url(profile_url, section)
             
             # Add natural delay before navigating
             delay = random.uniform(2, 5)
-            logger.info(f"Waiting {delay:.1f} seconds before navigating to {section} section")
+            logger.info("Waiting %.1f seconds before navigating to %s section", delay, section)
             time.sleep(delay)
             
             # Navigate to section
-            logger.info(f"Navigating to {section} section: {section_url}")
-            if not self.driver.navigate(section_url, wait_until="domcontentloaded"):
-                logger.error(f"Failed to navigate to {section} section")
+            logger.info("Navigating to %s section: %s", section, section_url)
+            if not self.driver.navigate(section_url, wait_until="commit"):
+                logger.error("Failed to navigate to %s section", section)
                 return False
+            self._viewport = None
             
-            # Randomized delay to allow page to render some content (1.0 to 3.4 seconds with millisecond precision)
-            time.sleep(1.0 + random.random() * 2.4)
+            # Wait until at least the main content has loaded
+            self.driver.wait_until_ready()
             
             # Verify we're on the right section page
-            current_url = self.driver.evaluate("() => window.location.href")
+            current_url = self.driver.get_current_url()
             if section not in current_url:
-                logger.warning(f"Expected to be on {section} section but current URL is {current_url}")
+                logger.warning("Expected to be on %s section but current URL is %s", section, current_url)
             
             # Sometimes scroll section with pauses
             if random.random() < 0.7:  # 70% chance
-                scroll_duration = random.uniform(3, 10)
-                logger.info(f"Scrolling {section} section for {scroll_duration:.1f} seconds")
+                scroll_duration = section_read_time(section)
+                logger.info("Scrolling %s section for %.1f seconds", section, scroll_duration)
                 self._scroll_with_human_behavior(duration=scroll_duration)
             
             return True
             
         except Exception as e:
-            logger.error(f"Error navigating to profile section: {str(e)}")
+            logger.error("Error navigating to profile section: %s", e)
             return False
 
     def _scroll_with_human_behavior(self, duration: float = 30.0, scroll_range: Tuple[int, int] = (300, 800)) -> None:
@@ -213,40 +350,22 @@ class HumanLikeBehavior:
             return
         
         try:
-            end_time = time.time() + duration
+            # Measure the scrolling time against a monotonic deadline
+            deadline = time.monotonic() + duration
             
-            while time.time() < end_time:
+            while time.monotonic() < deadline:
                 # Random scroll distance
                 scroll_distance = random.randint(*scroll_range)
                 
                 # Scroll with a smooth motion
-                self.driver.evaluate(f"""
-                    () => {{
-                        // Calculate steps for smooth scrolling
-                        const distance = {scroll_distance};
-                        const steps = Math.floor(10 + Math.random() * 15); // 10-25 steps
-                        const delay = Math.floor(5 + Math.random() * 10); // 5-15ms between steps
-                        
-                        // Function to scroll smoothly
-                        const smoothScroll = async (steps, distance) => {{
-                            const stepSize = distance / steps;
-                            for (let i = 0; i < steps; i++) {{
-                                window.scrollBy(0, stepSize);
-                                await new Promise(r => setTimeout(r, delay));
-                            }}
-                        }};
-                        
-                        // Execute the smooth scroll
-                        smoothScroll(steps, distance);
-                    }}
-                """)
+                self.driver.evaluate(_SCROLL_CALL, arg={"distance": scroll_distance})
                 
                 # Record last scroll time
                 self.last_scroll_time = time.time()
                 
-                # Sometimes move the mouse while scrolling
-                if random.random() < 0.3:  # 30% chance
-                    self._simulate_mouse_movement()
+                # Sometimes move the mouse while scrolling, usually with a short path
+                if random.random() < 0.1:  # 10% chance
+                    self._simulate_mouse_movement(points=20 if random.random() < 0.1 else 3)
                 
                 # Pause between scrolls like a human would
                 pause_time = random.uniform(*SCROLL_PAUSE_TIME)
@@ -258,94 +377,35 @@ class HumanLikeBehavior:
                     time.sleep(read_time)
                     
         except Exception as e:
-            logger.error(f"Error during human-like scrolling: {str(e)}")
+            logger.error("Error during human-like scrolling: %s", e)
 
-    def _simulate_mouse_movement(self) -> None:
-        """Simulate human-like mouse movements."""
+    def _simulate_mouse_movement(self, points: int = 5) -> None:
+        """
+        Simulate human-like mouse movements.
+        
+        Args:
+            points: Number of segments in the bezier path, one mousemove event each
+        """
         if not self.driver:
             logger.error("Driver not set. Cannot simulate mouse movement.")
             return
         
         try:
             # Get page dimensions
-            dimensions = self.driver.evaluate("""
-                () => {
-                    return {
-                        width: document.documentElement.clientWidth,
-                        height: document.documentElement.clientHeight
-                    };
-                }
-            """)
-            
-            if not dimensions:
-                logger.warning("Could not get page dimensions, using defaults")
-                dimensions = {"width": 1366, "height": 768}
+            dimensions = self._get_viewport()
             
             # Generate random target coordinates
             x = random.randint(100, dimensions["width"] - 100)
             y = random.randint(100, dimensions["height"] - 100)
             
             # Move mouse with human-like motion
-            self.driver.evaluate(f"""
-                () => {{
-                    // Create a custom mouse event
-                    const moveMouse = (x, y) => {{
-                        const event = new MouseEvent('mousemove', {{
-                            'view': window,
-                            'bubbles': true,
-                            'cancelable': true,
-                            'clientX': x,
-                            'clientY': y
-                        }});
-                        document.dispatchEvent(event);
-                    }};
-                    
-                    // Get current mouse position from a mouse event listener
-                    let currentX = {x/2}; // Start roughly in the center
-                    let currentY = {y/2};
-                    
-                    // Generate bezier curve points for natural movement
-                    const points = 20;
-                    const bezierPoints = [];
-                    
-                    // Add control points for the bezier curve
-                    const cp1x = currentX + (Math.random() * 100) - 50;
-                    const cp1y = currentY + (Math.random() * 100) - 50;
-                    const cp2x = {x} - (Math.random() * 100) - 50;
-                    const cp2y = {y} - (Math.random() * 100) - 50;
-                    
-                    // Generate points along the bezier curve
-                    for (let i = 0; i <= points; i++) {{
-                        const t = i / points;
-                        const u = 1 - t;
-                        
-                        // Cubic bezier formula
-                        const x = (u*u*u * currentX) + (3 * u*u * t * cp1x) + (3 * u * t*t * cp2x) + (t*t*t * {x});
-                        const y = (u*u*u * currentY) + (3 * u*u * t * cp1y) + (3 * u * t*t * cp2y) + (t*t*t * {y});
-                        
-                        bezierPoints.push({{ x, y }});
-                    }}
-                    
-                    // Move the mouse along the curve with varying speed
-                    const moveMouseAlongPath = async () => {{
-                        for (const point of bezierPoints) {{
-                            // Vary the delay between movements
-                            const delay = 10 + Math.random() * 30;
-                            moveMouse(point.x, point.y);
-                            await new Promise(r => setTimeout(r, delay));
-                        }}
-                    }};
-                    
-                    // Execute the movement
-                    moveMouseAlongPath();
-                }}
-            """)
+            self.driver.evaluate(_MOUSE_CALL, arg={"x": x, "y": y, "points": points})
             
             # Record last mouse move time
             self.last_mouse_move_time = time.time()
             
         except Exception as e:
-            logger.error(f"Error simulating mouse movement: {str(e)}")
+            logger.error("Error simulating mouse movement: %s", e)
 
     def click_element(self, selector: str) -> bool:
         """
@@ -362,52 +422,16 @@ class HumanLikeBehavior:
             return False
         
         try:
-            # First check if element exists
-            element_exists = self.driver.wait_for_selector(selector, timeout=5000)
-            if not element_exists:
-                logger.error(f"Element not found: {selector}")
-                return False
-            
-            # Sometimes move mouse to element before clicking
+            # Sometimes move mouse to element before clicking (locate and hover in one round trip)
             if random.random() < 0.7:  # 70% chance
-                # Get element position
-                element_position = self.driver.evaluate(f"""
-                    () => {{
-                        const el = document.querySelector('{selector}');
-                        if (!el) return null;
-                        
-                        const rect = el.getBoundingClientRect();
-                        return {{
-                            x: rect.left + rect.width / 2,
-                            y: rect.top + rect.height / 2
-                        }};
-                    }}
-                """)
-                
-                if element_position:
-                    # Move mouse to element
-                    self.driver.evaluate(f"""
-                        () => {{
-                            const point = {element_position};
-                            
-                            // Create a custom mouse event
-                            const event = new MouseEvent('mousemove', {{
-                                'view': window,
-                                'bubbles': true,
-                                'cancelable': true,
-                                'clientX': point.x,
-                                'clientY': point.y
-                            }});
-                            
-                            document.dispatchEvent(event);
-                        }}
-                    """)
-                    
+                if self.driver.evaluate(_HOVER_CALL, arg=selector):
                     # Slight delay before clicking
                     time.sleep(random.uniform(0.3, 1.2))
             
-            # Click with a slight delay to simulate human click
-            self.driver.click(selector)
+            # Click; Playwright waits for the element itself
+            if not self.driver.click(selector, timeout=5000):
+                logger.error("Element not found: %s", selector)
+                return False
             
             # Record last click time
             self.last_click_time = time.time()
@@ -418,7 +442,7 @@ class HumanLikeBehavior:
             return True
             
         except Exception as e:
-            logger.error(f"Error clicking element {selector}: {str(e)}")
+            logger.error("Error clicking element %s: %s", selector, e)
             return False
 
     def simulate_reading(self, min_duration: float = 3.0, max_duration: float = 15.0) -> None:
@@ -430,35 +454,57 @@ class HumanLikeBehavior:
             max_duration: Maximum reading duration in seconds
         """
         duration = random.uniform(min_duration, max_duration)
-        logger.info(f"Simulating reading for {duration:.1f} seconds")
+        logger.info("Simulating reading for %.1f seconds", duration)
+        
+        # Divide the reading time into segments with occasional scrolls and
+        # mouse moves, and let the page play the whole plan in one call
+        plan = self._build_reading_plan(duration)
+        if self.driver.evaluate(_READ_CALL, arg=plan) is None:
+            logger.warning("Reading plan could not be run on the page")
+            return
+        
+        # Record the last interaction times
+        now = time.time()
+        if any("scroll" in step for step in plan):
+            self.last_scroll_time = now
+        if any("x" in step for step in plan):
+            self.last_mouse_move_time = now
+    
+    def _build_reading_plan(self, duration: float) -> List[Dict[str, Any]]:
+        """
+        Build the sequence of reading steps run in-page by simulate_reading.
         
-        # Divide the reading time into segments with occasional scrolls
-        time_spent = 0
-        while time_spent < duration:
+        Each step may scroll, move the mouse and then pause; the pauses add
+        up to the reading duration.
+        
+        Args:
+            duration: Total reading time in seconds
+            
+        Returns:
+            List of JSON-serializable steps
+        """
+        dimensions = self._get_viewport()
+        plan = []
+        remaining = duration
+        while remaining > 0:
             # Read for a while
-            read_segment = random.uniform(2.0, 5.0)
-            actual_segment = min(read_segment, duration - time_spent)
-            time.sleep(actual_segment)
-            time_spent += actual_segment
+            pause = min(random.uniform(2.0, 5.0), remaining)
+            plan.append({"sleep": pause})
+            remaining -= pause
             
             # Occasionally scroll a little
-            if random.random() < 0.6 and time_spent < duration:  # 60% chance
-                self.driver.evaluate("""
-                    () => {
-                        // Small scroll
-                        const distance = Math.floor(50 + Math.random() * 150);
-                        window.scrollBy(0, distance);
-                    }
-                """)
-                
-                # Record last scroll time
-                self.last_scroll_time = time.time()
-                
-                # Brief pause after scrolling
-                time.sleep(random.uniform(0.5, 1.5))
-                time_spent += 1.0
+            if random.random() < 0.6 and remaining > 0:  # 60% chance
+                # Brief pause after scrolling, never past the end of the reading time
+                pause = min(random.uniform(0.5, 1.5), remaining)
+                plan.append({"scroll": random.randint(50, 200), "sleep": pause})
+                remaining -= pause
             
             # Sometimes move the mouse
-            if random.random() < 0.3 and time_spent < duration:  # 30% chance
-                self._simulate_mouse_movement()
-                time_spent += 0.5
\ No newline at end of file
+            if random.random() < 0.3 and remaining > 0:  # 30% chance
+                plan.append({
+                    "x": random.randint(100, dimensions["width"] - 100),
+                    "y": random.randint(100, dimensions["height"] - 100),
+                    "points": 5
+                })
+        
+        return plan
\ No newline at end of file
@@ -6,6 +6,7 @@ This module handles LinkedIn navigation and content extraction,
 working with the human-like behavior module to ensure natural interaction.
 """
 
+import hashlib
 import logging
 import re
 import time
@@ -21,6 +22,16 @@ from services.linked_navigator.human_like_behavior import HumanLikeBehavior
 
 logger = logging.getLogger(__name__)
 
+# Only present on /details/ pages, where it leads back to the main profile
+DETAILS_PAGE_SELECTOR = 'button[aria-label="Back to the main profile page"]'
+
+# Any of the back buttons LinkedIn has used on /details/ pages
+BACK_BUTTON_SELECTOR = (
+    'button[aria-label="Back to the main profile page"], '
+    'button[aria-label*="Back"], '
+    'button.artdeco-button--circle:has(svg[data-test-icon="arrow-left-medium"])'
+)
+
 class LinkedInNavigator:
     """
     LinkedIn Profile Navigator.
@@ -36,7 +47,9 @@ class LinkedInNavigator:
         behavior: Optional[HumanLikeBehavior] = None,
         headless: bool = False,
         cookies_file: Optional[str] = None,
-        profile_path: Optional[str] = None
+        profile_path: Optional[str] = None,
+        html_cache_dir: Optional[str] = None,
+        html_cache_ttl: float = 3600
     ):
         """
         Initialize the LinkedIn Navigator.
@@ -48,11 +61,15 @@ class LinkedInNavigator:
             headless: Whether to run the browser in headless mode
             cookies_file: Path to cookies file for authentication
             profile_path: Path to browser profile for persistent sessions
+            html_cache_dir: Optional directory for caching section HTML between runs
+            html_cache_ttl: Seconds a cached section page stays valid
         """
         self.profile_url = self._normalize_profile_url(profile_url)
         self.headless = headless
         self.cookies_file = cookies_file
         self.profile_path = profile_path
+        self.html_cache_dir = html_cache_dir
+        self.html_cache_ttl = html_cache_ttl
         
         # Use provided driver or create a new one later
         self.driver = driver
@@ -235,8 +252,8 @@ class LinkedInNavigator:
                 logger.error(self.last_error)
                 return False
             
-            # Allow a very short time for page to stabilize
-            time.sleep(1)
+            # Wait for the page to finish rendering
+            self.driver.wait_until_ready()
             
             # Extract the HTML
             self.experience_html = self.driver.get_content()
@@ -317,8 +334,8 @@ class LinkedInNavigator:
                 logger.error(self.last_error)
                 return False
             
-            # Allow a very short time for page to stabilize
-            time.sleep(1)
+            # Wait for the page to finish rendering
+            self.driver.wait_until_ready()
             
             # Extract the HTML
             self.skills_html = self.driver.get_content()
@@ -359,8 +376,8 @@ class LinkedInNavigator:
                 logger.error(self.last_error)
                 return False
             
-            # Allow a very short time for page to stabilize
-            time.sleep(1)
+            # Wait for the page to finish rendering
+            self.driver.wait_until_ready()
             
             # Extract the HTML
             self.recommendations_html = self.driver.get_content()
@@ -401,8 +418,8 @@ class LinkedInNavigator:
                 logger.error(self.last_error)
                 return False
             
-            # Allow a very short time for page to stabilize
-            time.sleep(1)
+            # Wait for the page to finish rendering
+            self.driver.wait_until_ready()
             
             # Extract the HTML
             self.courses_html = self.driver.get_content()
@@ -443,8 +460,8 @@ class LinkedInNavigator:
                 logger.error(self.last_error)
                 return False
             
-            # Allow a very short time for page to stabilize
-            time.sleep(1)
+            # Wait for the page to finish rendering
+            self.driver.wait_until_ready()
             
             # Extract the HTML
             self.languages_html = self.driver.get_content()
@@ -485,8 +502,8 @@ class LinkedInNavigator:
                 logger.error(self.last_error)
                 return False
             
-            # Allow a very short time for page to stabilize
-            time.sleep(1)
+            # Wait for the page to finish rendering
+            self.driver.wait_until_ready()
             
             # Extract the HTML
             self.interests_html = self.driver.get_content()
@@ -629,10 +646,20 @@ class LinkedInNavigator:
                 try:
                     logger.info(f"Processing section: {section_name} with URL: {section_url}")
                     
+                    # Reuse a recently cached copy of the section instead of fetching it again
+                    cache_key = f"{self.profile_url}#{section_name}"
+                    cached_html = self._html_cache_get(cache_key)
+                    if cached_html:
+                        logger.info(f"Using cached HTML for {section_name} section")
+                        self._store_section_html(section_name, cached_html)
+                        continue
+                    
                     # Navigate to the section using the extracted URL
                     if self._navigate_to_section_url(section_url):
                         # Store the HTML based on section name
-                        self._store_section_html(section_name)
+                        html_content = self._store_section_html(section_name)
+                        if html_content:
+                            self._html_cache_put(cache_key, html_content)
                         
                         # Return to main profile using the back button
                         self._click_back_button()
@@ -694,11 +721,12 @@ class LinkedInNavigator:
             logger.info(f"Waiting {delay:.2f} seconds before navigation...")
             time.sleep(delay)
             
-            # Navigate to the URL
+            # Navigate to the URL, through LinkedIn's in-page router when the page exposes one
             logger.info(f"Navigating to section URL: {url}")
-            if not self.driver.navigate(url, wait_until="domcontentloaded"):
-                logger.error("Failed to navigate to section URL")
-                return False
+            if not self.driver.soft_navigate(url, DETAILS_PAGE_SELECTOR):
+                if not self.driver.navigate(url, wait_until="domcontentloaded"):
+                    logger.error("Failed to navigate to section URL")
+                    return False
             
             # Allow a randomized time for page to stabilize (between 1.0 and 3.4 seconds with millisecond precision)
             time.sleep(1.0 + random.random() * 2.4)
@@ -708,19 +736,24 @@ class LinkedInNavigator:
             logger.error(f"Error navigating to section URL: {str(e)}")
             return False
 
-    def _store_section_html(self, section_name: str) -> None:
+    def _store_section_html(self, section_name: str, html_content: Optional[str] = None) -> Optional[str]:
         """
         Store the HTML content for a specific section.
         
         Args:
             section_name: Name of the section (experience, education, etc.)
+            html_content: HTML to store (defaults to the current page content)
+            
+        Returns:
+            The stored HTML, or None if nothing was stored
         """
         try:
-            html_content = self.driver.get_content()
+            if html_content is None:
+                html_content = self.driver.get_content()
             
             if not html_content:
                 logger.warning(f"No HTML content retrieved for {section_name} section")
-                return
+                return None
                 
             # Store the HTML based on section type
             if section_name == "experience":
@@ -744,8 +777,62 @@ class LinkedInNavigator:
                 
             logger.info(f"Successfully stored HTML for {section_name} section")
             logger.info(f"{section_name.capitalize()} HTML length: {len(html_content)}")
+            return html_content
         except Exception as e:
             logger.error(f"Error storing HTML for {section_name} section: {str(e)}")
+            return None
+    
+    def _html_cache_path(self, key: str) -> str:
+        """
+        Get the cache file path for a key.
+        
+        Args:
+            key: Cache key
+            
+        Returns:
+            Path of the cache file
+        """
+        return os.path.join(self.html_cache_dir, hashlib.sha1(key.encode("utf-8")).hexdigest() + ".html")
+    
+    def _html_cache_get(self, key: str) -> Optional[str]:
+        """
+        Read cached HTML if caching is enabled and the entry is still fresh.
+        
+        Args:
+            key: Cache key
+            
+        Returns:
+            Cached HTML, or None on a miss
+        """
+        if not self.html_cache_dir:
+            return None
+        
+        path = self._html_cache_path(key)
+        try:
+            if time.time() - os.path.getmtime(path) > self.html_cache_ttl:
+                return None
+            with open(path, 'r', encoding='utf-8') as f:
+                return f.read()
+        except OSError:
+            return None
+    
+    def _html_cache_put(self, key: str, html_content: str) -> None:
+        """
+        Write HTML to the cache if caching is enabled.
+        
+        Args:
+            key: Cache key
+            html_content: HTML to cache
+        """
+        if not self.html_cache_dir:
+            return
+        
+        try:
+            os.makedirs(self.html_cache_dir, exist_ok=True)
+            with open(self._html_cache_path(key), 'w', encoding='utf-8') as f:
+                f.write(html_content)
+        except OSError as e:
+            logger.warning(f"Could not cache HTML for {key}: {str(e)}")
 
     def _click_back_button(self) -> bool:
         """
@@ -759,24 +846,11 @@ class LinkedInNavigator:
             return False
         
         try:
-            # Use JavaScript to find and click the back button
-            clicked = self.driver.evaluate("""
-                () => {
-                    // Look for the back button using various attributes
-                    const backButton = document.querySelector('button[aria-label="Back to the main profile page"]') || 
-                                    document.querySelector('button[aria-label*="Back"]') || 
-                                    document.querySelector('button.artdeco-button--circle svg[data-test-icon="arrow-left-medium"]').closest('button');
-                    
-                    if (backButton) {
-                        // Add a small delay before clicking to appear more human-like
-                        setTimeout(() => {
-                            backButton.click();
-                        }, Math.random() * 500 + 300);
-                        return true;
-                    }
-                    return false;
-                }
-            """)
+            # Pause briefly before clicking to appear more human-like
+            time.sleep(random.uniform(0.3, 0.8))
+            
+            # Let Playwright find and click the back button
+            clicked = self.driver.click(BACK_BUTTON_SELECTOR, timeout=2000)
             
             if clicked:
                 logger.info("Successfully clicked back button")
@@ -8,7 +8,7 @@ import os
 import logging
 import threading
 import time
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime
 
 from config.scraper_config import PROFILE_QUEUE_PATH, EVENTS
@@ -31,12 +31,21 @@ class QueueManager:
             queue_file_path: Path to the queue file
         """
         self.queue_file_path = queue_file_path
+        self.wal_path = os.path.splitext(queue_file_path)[0] + ".wal"
         self.lock = threading.Lock()
         self.event_bus = EventBus.get_instance()
         
+        # Stats of the last parsed queue file, keyed by (inode, mtime_ns, size);
+        # cleared on every write made through this manager
+        self._stats_key = None
+        self._stats_cache = None
+        
         # Initialize the queue file if it doesn't exist
         if not os.path.exists(queue_file_path):
             self._write_queue([])
+        
+        # Apply status updates left behind by an interrupted batch
+        self._replay_wal()
     
     def _read_queue(self) -> List[Dict[str, Any]]:
         """
@@ -47,7 +56,7 @@ class QueueManager:
         """
         try:
             with open(self.queue_file_path, 'r') as f:
-                return json.load(f)
+                return json.loads(f.read())
         except (json.JSONDecodeError, FileNotFoundError):
             logger.warning(f"Queue file at {self.queue_file_path} not found or invalid. Creating new queue.")
             return []
@@ -60,10 +69,64 @@ class QueueManager:
             queue: List of profile entries to write
         """
         os.makedirs(os.path.dirname(self.queue_file_path), exist_ok=True)
-        with open(self.queue_file_path, 'w') as f:
-            json.dump(queue, f, indent=2)
+        
+        # Our own writes can keep the size and mtime tick unchanged, so never trust the key across them
+        self._stats_key = None
+        
+        # Write to a temp file and swap it in so readers never see a partial file
+        tmp_path = self.queue_file_path + ".tmp"
+        with open(tmp_path, 'w') as f:
+            f.write(json.dumps(queue, indent=2))
+        os.replace(tmp_path, self.queue_file_path)
     
-    def add_profile(self, url: str, urgent: bool = False, initiator: str = "") -> bool:
+    def _upsert_profile(self, queue: List[Dict[str, Any]], url: str, urgent: bool, initiator: str) -> str:
+        """
+        Add a profile to an in-memory queue, or refresh its existing entry.
+        
+        Args:
+            queue: List of profile entries to update
+            url: LinkedIn profile URL
+            urgent: Whether this is an urgent request
+            initiator: Who/what initiated this request
+            
+        Returns:
+            "added" for a new entry, "already_queued" if the profile was already in the queue
+        """
+        # Check if profile is already in queue
+        for entry in queue:
+            if entry["url"] == url:
+                if entry["done"]:
+                    # If already processed, update it to be reprocessed
+                    entry["done"] = False
+                    entry["urgent"] = urgent or entry["urgent"]
+                    entry["initiator"] = initiator or entry["initiator"]
+                    entry["updated_at"] = datetime.now().isoformat()
+                    logger.info(f"Profile {url} already in queue but marked for reprocessing")
+                else:
+                    # If already in queue but not processed, update priority if needed
+                    if urgent and not entry["urgent"]:
+                        entry["urgent"] = True
+                        entry["updated_at"] = datetime.now().isoformat()
+                        logger.info(f"Updated profile {url} to urgent priority")
+                    else:
+                        logger.info(f"Profile {url} already in queue")
+                return "already_queued"
+        
+        # If not in queue, add it
+        now = datetime.now().isoformat()
+        queue.append({
+            "url": url,
+            "done": False,
+            "urgent": urgent,
+            "initiator": initiator,
+            "created_at": now,
+            "updated_at": now,
+            "status": "queued"
+        })
+        logger.info(f"Added profile {url} to queue")
+        return "added"
+    
+    def add_profile(self, url: str, urgent: bool = False, initiator: str = "") -> str:
         """
         Add a profile to the queue.
         
@@ -73,49 +136,45 @@ class QueueManager:
             initiator: Who/what initiated this request
             
         Returns:
-            True if added successfully, False otherwise
+            "added" for a new entry, "already_queued" if the profile was
+            already in the queue, or "failed" if the queue could not be saved
         """
         with self.lock:
             queue = self._read_queue()
+            result = self._upsert_profile(queue, url, urgent, initiator)
+            try:
+                self._write_queue(queue)
+            except OSError as e:
+                logger.error(f"Failed to save queue after adding {url}: {str(e)}")
+                return "failed"
+        
+        # Publish after releasing the lock so handlers can query the queue
+        action = "added" if result == "added" else "updated"
+        self.event_bus.publish(EVENTS.QUEUE_UPDATED, {"action": action, "url": url})
+        return result
+    
+    def add_profiles_bulk(self, urls: List[str], urgent: bool = False, initiator: str = "") -> List[Tuple[str, str]]:
+        """
+        Add several profiles to the queue with a single read and write.
+        
+        Args:
+            urls: LinkedIn profile URLs
+            urgent: Whether these are urgent requests
+            initiator: Who/what initiated this request
             
-            # Check if profile is already in queue
-            for entry in queue:
-                if entry["url"] == url:
-                    if entry["done"]:
-                        # If already processed, update it to be reprocessed
-                        entry["done"] = False
-                        entry["urgent"] = urgent or entry["urgent"]
-                        entry["initiator"] = initiator or entry["initiator"]
-                        entry["updated_at"] = datetime.now().isoformat()
-                        logger.info(f"Profile {url} already in queue but marked for reprocessing")
-                    else:
-                        # If already in queue but not processed, update priority if needed
-                        if urgent and not entry["urgent"]:
-                            entry["urgent"] = True
-                            entry["updated_at"] = datetime.now().isoformat()
-                            logger.info(f"Updated profile {url} to urgent priority")
-                        else:
-                            logger.info(f"Profile {url} already in queue")
-                    
-                    self._write_queue(queue)
-                    self.event_bus.publish(EVENTS["QUEUE_UPDATED"], {"action": "updated", "url": url})
-                    return True
-            
-            # If not in queue, add it
-            queue.append({
-                "url": url,
-                "done": False,
-                "urgent": urgent,
-                "initiator": initiator,
-                "created_at": datetime.now().isoformat(),
-                "updated_at": datetime.now().isoformat(),
-                "status": "queued"
-            })
-            
+        Returns:
+            List of (status, url) tuples, status being "added" or "already_queued"
+        """
+        if not urls:
+            return []
+        
+        with self.lock:
+            queue = self._read_queue()
+            results = [(self._upsert_profile(queue, url, urgent, initiator), url) for url in urls]
             self._write_queue(queue)
-            logger.info(f"Added profile {url} to queue")
-            self.event_bus.publish(EVENTS["QUEUE_UPDATED"], {"action": "added", "url": url})
-            return True
+        
+        self.event_bus.publish(EVENTS.QUEUE_UPDATED, {"action": "bulk_added", "urls": list(urls)})
+        return results
     
     def get_next_profiles(self, count: int = 1, include_done: bool = False) -> List[Dict[str, Any]]:
         """
@@ -140,6 +199,57 @@ class QueueManager:
             
             return sorted_queue[:count]
     
+    def _apply_status(self, queue: List[Dict[str, Any]], url: str, status: str,
+                      metadata: Optional[Dict[str, Any]], updated_at: str) -> bool:
+        """
+        Apply a status update to an in-memory queue.
+        
+        Args:
+            queue: List of profile entries to update
+            url: Profile URL
+            status: New status
+            metadata: Optional metadata to merge into the entry
+            updated_at: ISO timestamp of the update
+            
+        Returns:
+            True if the profile was found, False otherwise
+        """
+        for entry in queue:
+            if entry["url"] == url:
+                entry["status"] = status
+                entry["updated_at"] = updated_at
+                
+                if status == "completed":
+                    entry["done"] = True
+                
+                if metadata:
+                    if "metadata" not in entry:
+                        entry["metadata"] = {}
+                    entry["metadata"].update(metadata)
+                
+                return True
+        
+        return False
+    
+    def _publish_status(self, url: str, status: str, metadata: Optional[Dict[str, Any]]) -> None:
+        """
+        Publish the event matching a profile status update.
+        
+        Args:
+            url: Profile URL
+            status: New status
+            metadata: Metadata stored with the update
+        """
+        event_type = (EVENTS.PROFILE_SCRAPED if status == "completed" 
+                     else EVENTS.PROFILE_FAILED if status == "failed"
+                     else EVENTS.QUEUE_UPDATED)
+        
+        self.event_bus.publish(event_type, {
+            "url": url, 
+            "status": status,
+            "metadata": metadata
+        })
+    
     def mark_profile_status(self, url: str, status: str, metadata: Optional[Dict[str, Any]] = None) -> bool:
         """
         Mark a profile's status in the queue.
@@ -155,36 +265,160 @@ class QueueManager:
         with self.lock:
             queue = self._read_queue()
             
-            for entry in queue:
-                if entry["url"] == url:
-                    entry["status"] = status
-                    entry["updated_at"] = datetime.now().isoformat()
-                    
-                    if status == "completed":
-                        entry["done"] = True
-                    
-                    if metadata:
-                        if "metadata" not in entry:
-                            entry["metadata"] = {}
-                        entry["metadata"].update(metadata)
-                    
-                    self._write_queue(queue)
-                    
-                    event_type = (EVENTS["PROFILE_SCRAPED"] if status == "completed" 
-                                 else EVENTS["PROFILE_FAILED"] if status == "failed"
-                                 else EVENTS["QUEUE_UPDATED"])
-                    
-                    self.event_bus.publish(event_type, {
-                        "url": url, 
-                        "status": status,
-                        "metadata": metadata
-                    })
-                    
-                    logger.info(f"Updated profile {url} status to {status}")
-                    return True
+            if not self._apply_status(queue, url, status, metadata, datetime.now().isoformat()):
+                logger.warning(f"Profile {url} not found in queue")
+                return False
             
-            logger.warning(f"Profile {url} not found in queue")
-            return False
+            self._write_queue(queue)
+        
+        self._publish_status(url, status, metadata)
+        
+        logger.info(f"Updated profile {url} status to {status}")
+        return True
+    
+    def log_profile_status(self, url: str, status: str, metadata: Optional[Dict[str, Any]] = None) -> None:
+        """
+        Append a status update to the write-ahead log without rewriting the queue.
+        
+        The update is applied to the queue file by the next call to
+        mark_profile_status_batch, or replayed on startup. The log is not
+        fsynced, so it survives a crash of the process but not of the machine.
+        
+        Args:
+            url: Profile URL
+            status: New status
+            metadata: Optional metadata to store with the status update
+        """
+        line = json.dumps({
+            "url": url,
+            "status": status,
+            "metadata": metadata,
+            "updated_at": datetime.now().isoformat()
+        })
+        
+        with self.lock:
+            with open(self.wal_path, 'a') as f:
+                f.write(line + "\n")
+    
+    def mark_profile_status_batch(self, updates: List[Tuple[str, str, Optional[Dict[str, Any]]]]) -> int:
+        """
+        Apply several status updates with a single queue rewrite.
+        
+        Everything already in the write-ahead log is applied as well, so
+        entries logged by other callers are never dropped when the log is cleared.
+        
+        Args:
+            updates: List of (url, status, metadata) tuples
+            
+        Returns:
+            Number of the given profiles that were found and updated
+        """
+        if not updates:
+            return 0
+        
+        applied = []
+        
+        with self.lock:
+            # Move the log aside first; anything appended meanwhile goes to a new file
+            self._rotate_wal()
+            wal_files = self._rotated_wal_files()
+            
+            queue = self._read_queue()
+            self._apply_wal_files(queue, wal_files)
+            updated_at = datetime.now().isoformat()
+            
+            for url, status, metadata in updates:
+                if self._apply_status(queue, url, status, metadata, updated_at):
+                    applied.append((url, status, metadata))
+                else:
+                    logger.warning(f"Profile {url} not found in queue")
+            
+            self._write_queue(queue)
+            self._remove_wal_files(wal_files)
+        
+        for url, status, metadata in applied:
+            self._publish_status(url, status, metadata)
+        
+        logger.info(f"Updated status of {len(applied)} profiles in one batch")
+        return len(applied)
+    
+    def _replay_wal(self) -> None:
+        """Apply and clear any status updates left in the write-ahead log."""
+        with self.lock:
+            self._rotate_wal()
+            wal_files = self._rotated_wal_files()
+            if not wal_files:
+                return
+            
+            queue = self._read_queue()
+            replayed = self._apply_wal_files(queue, wal_files)
+            
+            if replayed:
+                self._write_queue(queue)
+                logger.info(f"Replayed {replayed} status updates from {self.wal_path}")
+            
+            self._remove_wal_files(wal_files)
+    
+    def _rotate_wal(self) -> None:
+        """Rename the live write-ahead log to a numbered file that is applied and then removed."""
+        try:
+            os.replace(self.wal_path, f"{self.wal_path}.{time.time_ns()}")
+        except FileNotFoundError:
+            pass
+    
+    def _rotated_wal_files(self) -> List[str]:
+        """
+        List rotated write-ahead logs that have not been applied yet.
+        
+        Returns:
+            Paths of the rotated logs, oldest first
+        """
+        directory = os.path.dirname(self.wal_path) or "."
+        prefix = os.path.basename(self.wal_path) + "."
+        generations = sorted(
+            int(name[len(prefix):]) for name in os.listdir(directory)
+            if name.startswith(prefix) and name[len(prefix):].isdigit()
+        )
+        return [f"{self.wal_path}.{generation}" for generation in generations]
+    
+    def _apply_wal_files(self, queue: List[Dict[str, Any]], wal_files: List[str]) -> int:
+        """
+        Apply the status updates in write-ahead log files to an in-memory queue.
+        
+        Args:
+            queue: List of profile entries to update
+            wal_files: Log files to apply, oldest first
+            
+        Returns:
+            Number of updates that matched a profile
+        """
+        applied = 0
+        for path in wal_files:
+            with open(path, 'r') as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        # Torn final line from an interrupted append
+                        continue
+                    
+                    if self._apply_status(queue, record["url"], record["status"],
+                                          record.get("metadata"), record["updated_at"]):
+                        applied += 1
+        return applied
+    
+    def _remove_wal_files(self, wal_files: List[str]) -> None:
+        """
+        Remove write-ahead log files once their updates are in the queue file.
+        
+        Args:
+            wal_files: Log files to remove
+        """
+        for path in wal_files:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
     
     def get_queue_stats(self) -> Dict[str, Any]:
         """
@@ -194,6 +428,17 @@ class QueueManager:
             Dictionary with queue statistics
         """
         with self.lock:
+            try:
+                st = os.stat(self.queue_file_path)
+                stats_key = (st.st_ino, st.st_mtime_ns, st.st_size)
+            except FileNotFoundError:
+                stats_key = None
+            
+            # Skip the re-parse when the queue file hasn't changed
+            if stats_key is not None and stats_key == self._stats_key:
+                return dict(self._stats_cache, status_counts=dict(self._stats_cache["status_counts"]),
+                            last_updated=datetime.now().isoformat())
+            
             queue = self._read_queue()
             
             total = len(queue)
@@ -207,7 +452,7 @@ class QueueManager:
                 status = entry.get("status", "unknown")
                 status_counts[status] = status_counts.get(status, 0) + 1
             
-            return {
+            stats = {
                 "total": total,
                 "pending": pending,
                 "completed": completed,
@@ -215,6 +460,10 @@ class QueueManager:
                 "status_counts": status_counts,
                 "last_updated": datetime.now().isoformat()
             }
+            
+            self._stats_key = stats_key
+            self._stats_cache = stats
+            return dict(stats, status_counts=dict(status_counts))
     
     def clear_queue(self) -> bool:
         """
@@ -226,5 +475,6 @@ class QueueManager:
         with self.lock:
             self._write_queue([])
             logger.info("Queue cleared")
-            self.event_bus.publish(EVENTS["QUEUE_UPDATED"], {"action": "cleared"})
-            return True
\ No newline at end of file
+        
+        self.event_bus.publish(EVENTS.QUEUE_UPDATED, {"action": "cleared"})
+        return True
\ No newline at end of file
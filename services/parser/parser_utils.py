@@ -125,7 +125,7 @@ def batch_parse_profiles(
     Returns:
         Dictionary with parsing statistics and results
     """
-    start_time = time.time()
+    start_time = time.perf_counter()
     
     # Find all profile directories
     profile_dirs = find_profile_directories(base_dir)
@@ -179,7 +179,7 @@ def batch_parse_profiles(
                 logger.error(f"Exception while parsing {profile_dir}: {str(e)}")
     
     # Calculate statistics
-    elapsed_time = time.time() - start_time
+    elapsed_time = time.perf_counter() - start_time
     
     results = {
         "status": "completed",
@@ -0,0 +1,77 @@
+# batch_processor_test.py
+"""
+Tests for profile URL cleaning in the batch processor.
+
+Run with: python -m unittest discover -s tests/unit_tests -p "*_test.py"
+"""
+
+import os
+import sys
+import shutil
+import tempfile
+import unittest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from utils.event_bus import EventBus
+from utils.state_machine import StateMachine
+from services.linked_navigator.queue_manager import QueueManager
+from services.linked_navigator.brain import Brain
+from services.linked_navigator.batch_processor import BatchProcessor
+
+CANONICAL_URL = "https://www.linkedin.com/in/someone"
+
+
+class CleanProfileUrlTest(unittest.TestCase):
+    """Every accepted profile URL must be queued in canonical form."""
+
+    def setUp(self):
+        # Fresh singletons so subscribers and state don't leak between tests
+        EventBus._instance = None
+        StateMachine._instance = None
+
+        self.tmp_dir = tempfile.mkdtemp()
+        self.queue_manager = QueueManager(os.path.join(self.tmp_dir, "profile_queue.json"))
+        self.brain = Brain(os.path.join(self.tmp_dir, "memory.json"), queue_manager=self.queue_manager)
+        self.batch_processor = BatchProcessor(self.brain, self.queue_manager)
+
+    def tearDown(self):
+        self.batch_processor.shutdown()
+        self.brain.close()
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def test_variants_are_canonicalized(self):
+        for url in (
+            CANONICAL_URL,
+            "  https://www.linkedin.com/in/someone/  ",
+            "www.linkedin.com/in/someone",
+            "linkedin.com/in/someone",
+            "http://linkedin.com/in/someone",
+            "https://uk.linkedin.com/in/someone",
+            "https://www.linkedin.com/in/someone/details/experience/",
+            "https://www.linkedin.com/in/someone?trk=public_profile",
+            "https://www.linkedin.com/in/someone#experience",
+        ):
+            with self.subTest(url=url):
+                self.assertEqual(self.batch_processor._clean_profile_url(url), CANONICAL_URL)
+
+    def test_tracking_variants_are_queued_once(self):
+        # Queue without activating the brain
+        results = self.batch_processor._enqueue_profiles([
+            "https://www.linkedin.com/in/someone?trk=a",
+            "https://www.linkedin.com/in/someone?trk=b",
+            "https://www.linkedin.com/in/someone/#about"
+        ], False, "test")
+
+        self.assertEqual(results["added"], [CANONICAL_URL])
+        self.assertEqual(results["already_queued"], [CANONICAL_URL, CANONICAL_URL])
+
+    def test_non_profile_urls_are_rejected(self):
+        for url in ("https://www.linkedin.com/company/someone", "https://example.com/in/someone", ""):
+            with self.subTest(url=url):
+                with self.assertRaises(ValueError):
+                    self.batch_processor._clean_profile_url(url)
+
+
+if __name__ == "__main__":
+    unittest.main()
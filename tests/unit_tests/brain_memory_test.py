@@ -0,0 +1,199 @@
+# brain_memory_test.py
+"""
+Tests for the Brain's memory snapshot, write-ahead log, profile database and
+daily session history.
+
+Run with: python -m unittest discover -s tests/unit_tests -p "*_test.py"
+"""
+
+import os
+import sys
+import json
+import shutil
+import tempfile
+import unittest
+from datetime import datetime
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from utils.event_bus import EventBus
+from utils.state_machine import StateMachine
+from services.linked_navigator.queue_manager import QueueManager
+from services.linked_navigator.brain import Brain
+
+PROFILE_URL = "https://www.linkedin.com/in/someone"
+
+
+def _session(hour=10, completed=2, failed=1):
+    start = datetime.now().replace(hour=hour, minute=0, second=0, microsecond=0)
+    return {
+        "session_id": f"session-{hour}",
+        "start_time": start.isoformat(),
+        "end_time": start.replace(minute=30).isoformat(),
+        "end_time_epoch": start.replace(minute=30).timestamp(),
+        "profiles_completed": completed,
+        "profiles_failed": failed
+    }
+
+
+class BrainMemoryTest(unittest.TestCase):
+    """Memory events must survive restarts without being lost or counted twice."""
+
+    def setUp(self):
+        # Fresh singletons so subscribers and state don't leak between tests
+        EventBus._instance = None
+        StateMachine._instance = None
+
+        self.tmp_dir = tempfile.mkdtemp()
+        self.memory_path = os.path.join(self.tmp_dir, "memory.json")
+        self.queue_manager = QueueManager(os.path.join(self.tmp_dir, "profile_queue.json"))
+        self.brains = []
+
+    def tearDown(self):
+        for brain in self.brains:
+            brain.close()
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def _brain(self):
+        brain = Brain(self.memory_path, queue_manager=self.queue_manager)
+        self.brains.append(brain)
+        return brain
+
+    def _crash(self, brain):
+        # Stop without compacting, leaving the write-ahead log behind
+        brain._dirty_events = 0
+        brain.close()
+
+    def _write_memory_file(self, memory):
+        with open(self.memory_path, 'w') as f:
+            json.dump(memory, f)
+
+    def test_logged_sessions_are_replayed_after_a_crash(self):
+        brain = self._brain()
+        brain._persist_records([{"t": "session", "session": _session()}])
+        self._crash(brain)
+
+        restarted = self._brain()
+
+        self.assertEqual(restarted._memory["statistics"], {
+            "total_sessions": 1, "total_profiles_scraped": 2, "total_profiles_failed": 1
+        })
+        self.assertEqual(os.path.getsize(restarted.wal_path), 0)
+
+    def test_crash_between_snapshot_and_log_reset_does_not_double_count(self):
+        brain = self._brain()
+        brain._persist_records([{"t": "session", "session": _session(hour=9)}])
+        brain._persist_records([{"t": "session", "session": _session(hour=10)}])
+
+        # The snapshot is written but the process dies before the log is reset
+        brain._write_memory(brain._memory)
+        brain._persist_records([{"t": "session", "session": _session(hour=11)}])
+        self._crash(brain)
+
+        restarted = self._brain()
+
+        self.assertEqual(restarted._memory["statistics"]["total_sessions"], 3)
+        self.assertEqual(restarted._memory["wal_seq"], 3)
+
+    def test_records_logged_before_sequence_numbers_are_replayed(self):
+        brain = self._brain()
+        brain.close()
+        with open(brain.wal_path, 'w') as f:
+            f.write(json.dumps({"t": "session", "session": _session()}) + "\n")
+
+        restarted = self._brain()
+
+        self.assertEqual(restarted._memory["statistics"]["total_sessions"], 1)
+
+    def test_profiles_in_memory_file_move_to_database(self):
+        self._write_memory_file({
+            "statistics": {"total_sessions": 0, "total_profiles_scraped": 0, "total_profiles_failed": 0},
+            "profiles": {
+                PROFILE_URL: {
+                    "first_seen": "2024-01-01T10:00:00",
+                    "last_updated": "2024-01-02T10:00:00",
+                    "last_status": "completed",
+                    "history": [
+                        {"timestamp": "2024-01-01T10:00:00", "status": "failed", "metadata": {"error": "timeout"}},
+                        {"timestamp": "2024-01-02T10:00:00", "status": "completed", "metadata": {}}
+                    ]
+                }
+            }
+        })
+
+        brain = self._brain()
+
+        self.assertEqual(
+            brain.db.execute("SELECT url, first_seen, last_status FROM profiles").fetchall(),
+            [(PROFILE_URL, "2024-01-01T10:00:00", "completed")]
+        )
+        self.assertEqual(
+            brain.db.execute("SELECT status, meta FROM profile_history ORDER BY ts").fetchall(),
+            [("failed", '{"error": "timeout"}'), ("completed", "{}")]
+        )
+        with open(self.memory_path) as f:
+            self.assertNotIn("profiles", json.load(f))
+
+    def test_days_in_memory_file_move_to_session_history(self):
+        session = _session(hour=10)
+        self._write_memory_file({
+            "statistics": {"total_sessions": 1, "total_profiles_scraped": 2, "total_profiles_failed": 1},
+            "days": {session["start_time"][:10]: {"10": {"sessions": [session]}}}
+        })
+
+        brain = self._brain()
+
+        self.assertEqual(list(brain._read_session_history(session["start_time"][:10])), [session])
+        with open(self.memory_path) as f:
+            self.assertNotIn("days", json.load(f))
+
+    def test_interrupted_days_migration_does_not_duplicate_sessions(self):
+        first, second = _session(hour=9), _session(hour=10)
+        date_str = first["start_time"][:10]
+        self._write_memory_file({
+            "statistics": {"total_sessions": 2, "total_profiles_scraped": 4, "total_profiles_failed": 2},
+            "days": {date_str: {"9": {"sessions": [first]}, "10": {"sessions": [second]}}}
+        })
+
+        # An earlier migration appended the first session, then crashed before rewriting memory
+        with open(os.path.join(self.tmp_dir, f"sessions-{date_str}.jsonl"), 'w') as f:
+            f.write(json.dumps(first, separators=(",", ":")) + "\n")
+
+        brain = self._brain()
+
+        self.assertEqual(list(brain._read_session_history(date_str)), [first, second])
+
+    def test_days_migration_after_a_torn_append_keeps_every_session(self):
+        first, second = _session(hour=9), _session(hour=10)
+        date_str = first["start_time"][:10]
+        self._write_memory_file({
+            "statistics": {"total_sessions": 2, "total_profiles_scraped": 4, "total_profiles_failed": 2},
+            "days": {date_str: {"9": {"sessions": [first]}, "10": {"sessions": [second]}}}
+        })
+
+        # The interrupted migration stopped halfway through the second session
+        with open(os.path.join(self.tmp_dir, f"sessions-{date_str}.jsonl"), 'w') as f:
+            f.write(json.dumps(first, separators=(",", ":")) + "\n")
+            f.write(json.dumps(second, separators=(",", ":"))[:20])
+
+        brain = self._brain()
+
+        self.assertEqual(list(brain._read_session_history(date_str)), [first, second])
+
+    def test_todays_session_history_is_indexed(self):
+        today = datetime.now().date().isoformat()
+        first, second = _session(hour=10), dict(_session(hour=10), session_id="later")
+        second["end_time_epoch"] += 60
+        with open(os.path.join(self.tmp_dir, f"sessions-{today}.jsonl"), 'w') as f:
+            f.write(json.dumps(first) + "\n")
+            f.write(json.dumps(second) + "\n")
+            f.write('{"session_id": "torn", "start_ti')
+
+        brain = self._brain()
+
+        self.assertEqual(brain._session_counts, {(today, 10): 2})
+        self.assertEqual(brain._last_session_end, {(today, 10): second["end_time_epoch"]})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,113 @@
+# queue_manager_test.py
+"""
+Tests for the profile queue and its status write-ahead log.
+
+Run with: python -m unittest discover -s tests/unit_tests -p "*_test.py"
+"""
+
+import os
+import sys
+import shutil
+import tempfile
+import unittest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from utils.event_bus import EventBus
+from services.linked_navigator.queue_manager import QueueManager
+
+PROFILE_A = "https://www.linkedin.com/in/profile-a"
+PROFILE_B = "https://www.linkedin.com/in/profile-b"
+
+
+class QueueWalTest(unittest.TestCase):
+    """Status updates logged to the write-ahead log must reach the queue file."""
+
+    def setUp(self):
+        EventBus._instance = None
+        self.tmp_dir = tempfile.mkdtemp()
+        self.queue_path = os.path.join(self.tmp_dir, "profile_queue.json")
+        self.queue_manager = QueueManager(self.queue_path)
+        self.queue_manager.add_profiles_bulk([PROFILE_A, PROFILE_B])
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def _statuses(self, queue_manager):
+        return {entry["url"]: entry["status"]
+                for entry in queue_manager.get_next_profiles(10, include_done=True)}
+
+    def _wal_files(self):
+        return [name for name in os.listdir(self.tmp_dir) if ".wal" in name]
+
+    def test_logged_updates_are_replayed_after_a_crash(self):
+        self.queue_manager.log_profile_status(PROFILE_A, "completed", {"saved_to": "a"})
+
+        # A new manager on the same files stands in for a restarted process
+        restarted = QueueManager(self.queue_path)
+
+        self.assertEqual(self._statuses(restarted)[PROFILE_A], "completed")
+        self.assertEqual(self._wal_files(), [])
+
+    def test_torn_last_line_is_skipped(self):
+        self.queue_manager.log_profile_status(PROFILE_A, "completed")
+        with open(self.queue_manager.wal_path, 'a') as f:
+            f.write('{"url": "' + PROFILE_B + '", "stat')
+
+        restarted = QueueManager(self.queue_path)
+
+        statuses = self._statuses(restarted)
+        self.assertEqual(statuses[PROFILE_A], "completed")
+        self.assertEqual(statuses[PROFILE_B], "queued")
+
+    def test_batch_flush_keeps_entries_logged_by_other_callers(self):
+        self.queue_manager.log_profile_status(PROFILE_A, "completed")
+        self.queue_manager.log_profile_status(PROFILE_B, "failed", {"error": "timeout"})
+
+        # Only the first update is passed in; the second must not be lost
+        applied = self.queue_manager.mark_profile_status_batch([(PROFILE_A, "completed", None)])
+
+        self.assertEqual(applied, 1)
+        self.assertEqual(self._statuses(self.queue_manager), {PROFILE_A: "completed", PROFILE_B: "failed"})
+        self.assertEqual(self._wal_files(), [])
+
+    def test_rotated_log_left_by_an_interrupted_flush_is_replayed(self):
+        self.queue_manager.log_profile_status(PROFILE_A, "completed")
+        self.queue_manager._rotate_wal()
+        self.queue_manager.log_profile_status(PROFILE_B, "failed")
+
+        restarted = QueueManager(self.queue_path)
+
+        self.assertEqual(self._statuses(restarted), {PROFILE_A: "completed", PROFILE_B: "failed"})
+        self.assertEqual(self._wal_files(), [])
+
+
+class QueueStatsTest(unittest.TestCase):
+    """Cached queue stats must follow every write and never be shared with callers."""
+
+    def setUp(self):
+        EventBus._instance = None
+        self.tmp_dir = tempfile.mkdtemp()
+        self.queue_manager = QueueManager(os.path.join(self.tmp_dir, "profile_queue.json"))
+        self.queue_manager.add_profiles_bulk([PROFILE_A, PROFILE_B])
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def test_same_size_status_change_is_reflected(self):
+        self.assertEqual(self.queue_manager.get_queue_stats()["status_counts"], {"queued": 2})
+
+        # "queued" and "failed" have the same length, so the file size may not change
+        self.queue_manager.mark_profile_status(PROFILE_A, "failed")
+
+        self.assertEqual(self.queue_manager.get_queue_stats()["status_counts"], {"queued": 1, "failed": 1})
+
+    def test_returned_status_counts_are_not_shared(self):
+        self.queue_manager.get_queue_stats()["status_counts"]["queued"] = 99
+        self.queue_manager.get_queue_stats()["status_counts"].clear()
+
+        self.assertEqual(self.queue_manager.get_queue_stats()["status_counts"], {"queued": 2})
+
+
+if __name__ == "__main__":
+    unittest.main()
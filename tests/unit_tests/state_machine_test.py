@@ -0,0 +1,135 @@
+# state_machine_test.py
+"""
+Tests for the shared state machine driving the Brain's sessions.
+
+Run with: python -m unittest discover -s tests/unit_tests -p "*_test.py"
+"""
+
+import os
+import sys
+import logging
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from config.scraper_config import STATES, EVENTS
+from utils.event_bus import EventBus
+from utils.state_machine import StateMachine
+from services.linked_navigator.queue_manager import QueueManager
+from services.linked_navigator.brain import Brain
+from services.linked_navigator.batch_processor import BatchProcessor
+
+
+class SharedStateMachineTest(unittest.TestCase):
+    """Runs a session through the state machine shared by the Brain and the session worker."""
+
+    def setUp(self):
+        # Fresh singletons so subscribers and state don't leak between tests
+        EventBus._instance = None
+        StateMachine._instance = None
+
+        self.tmp_dir = tempfile.mkdtemp()
+        self.queue_manager = QueueManager(os.path.join(self.tmp_dir, "profile_queue.json"))
+
+        # Queue a profile before the Brain subscribes, so it doesn't activate itself
+        self.queue_manager.add_profile("https://www.linkedin.com/in/someone")
+
+        self.brain = Brain(os.path.join(self.tmp_dir, "memory.json"), queue_manager=self.queue_manager)
+        self.batch_processor = BatchProcessor(self.brain, self.queue_manager)
+
+    def tearDown(self):
+        self.batch_processor.shutdown()
+        self.brain.close()
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def test_components_share_one_machine(self):
+        self.assertIs(self.brain.state_machine, StateMachine.get_instance())
+        self.assertIs(self.batch_processor.state_machine, self.brain.state_machine)
+
+    def test_full_session_reaches_cooldown(self):
+        cooldown = threading.Event()
+        states = []
+
+        def on_state_changed(data):
+            states.append(data["new_state"])
+            if data["new_state"] == STATES.COOLDOWN_PERIOD:
+                cooldown.set()
+
+        EventBus.get_instance().subscribe(EVENTS.SYSTEM_STATE_CHANGED, on_state_changed)
+
+        # The worker finishes its profiles well before the session duration limit
+        self.batch_processor.register_session_callback(
+            lambda session: {"profiles_started": 1, "profiles_completed": 1, "profiles_failed": 0}
+        )
+
+        with self.assertNoLogs("utils.state_machine", level="ERROR"):
+            self.brain._transition(STATES.WAITING_FOR_ACTIVE_HOURS, "test")
+            self.brain._transition(STATES.PLANNING_NEXT_SESSION, "test")
+            self.brain._handle_planning_next_session()
+
+            # Start the planned session right away
+            session_plan = self.brain.state_machine.get_state_data()["session_plan"]
+            session_plan["planned_start_monotonic"] = 0.0
+            self.brain._handle_session_starting()
+
+            self.assertTrue(cooldown.wait(5.0), f"Session never reached cooldown: {states}")
+
+        self.assertEqual(states, [
+            STATES.WAITING_FOR_ACTIVE_HOURS,
+            STATES.PLANNING_NEXT_SESSION,
+            STATES.SESSION_STARTING,
+            STATES.FEED_BROWSING,
+            STATES.SESSION_ENDING,
+            STATES.COOLDOWN_PERIOD
+        ])
+        self.assertIsNone(self.brain.current_session)
+
+
+class StateChangeOrderingTest(unittest.TestCase):
+    """State change events must arrive in the order the changes happened."""
+
+    def setUp(self):
+        EventBus._instance = None
+        self.state_machine = StateMachine()
+
+    def test_concurrent_transitions_publish_in_order(self):
+        events = []
+        event_bus = EventBus.get_instance()
+
+        # A slow subscriber ahead of the recorder gives the other thread time to overtake
+        event_bus.subscribe(EVENTS.SYSTEM_STATE_CHANGED, lambda data: time.sleep(0.0005))
+        event_bus.subscribe(
+            EVENTS.SYSTEM_STATE_CHANGED,
+            lambda data: events.append((data["old_state"], data["new_state"]))
+        )
+
+        cycle = (STATES.WAITING_FOR_ACTIVE_HOURS, STATES.PLANNING_NEXT_SESSION, STATES.INACTIVE)
+
+        def run():
+            # Each thread walks the cycle; moves the other thread already made are rejected
+            for _ in range(50):
+                for state in cycle:
+                    self.state_machine.transition(state, "test")
+
+        logging.disable(logging.CRITICAL)
+        try:
+            threads = [threading.Thread(target=run) for _ in range(2)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        finally:
+            logging.disable(logging.NOTSET)
+
+        self.assertTrue(events)
+        for previous, current in zip(events, events[1:]):
+            self.assertEqual(previous[1], current[0])
+        self.assertEqual(events[-1][1], self.state_machine.get_current_state())
+
+
+if __name__ == "__main__":
+    unittest.main()
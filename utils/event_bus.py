@@ -34,6 +34,41 @@ class EventBus:
         self.subscribers = {}
         self.history = {}
         self.max_history = 100
+        
+        # Integer handles for publish_fast: event type -> handle, plus
+        # per-handle event names and subscriber snapshots
+        self._handles = {}
+        self._handle_names = []
+        self._handle_subscribers = []
+    
+    def resolve(self, event_type: str) -> int:
+        """
+        Resolve an event type to an integer handle for publish_fast.
+        
+        Args:
+            event_type: Type of event
+            
+        Returns:
+            Handle identifying the event type
+        """
+        handle = self._handles.get(event_type)
+        if handle is None:
+            handle = len(self._handle_names)
+            self._handle_names.append(event_type)
+            self._handle_subscribers.append(tuple(self.subscribers.get(event_type, ())))
+            self._handles[event_type] = handle
+        return handle
+    
+    def _refresh_handle(self, event_type: str) -> None:
+        """
+        Rebuild the subscriber snapshot of a resolved event type.
+        
+        Args:
+            event_type: Type of event whose subscribers changed
+        """
+        handle = self._handles.get(event_type)
+        if handle is not None:
+            self._handle_subscribers[handle] = tuple(self.subscribers.get(event_type, ()))
     
     def subscribe(self, event_type: str, callback: Callable) -> None:
         """
@@ -48,6 +83,7 @@ class EventBus:
         
         if callback not in self.subscribers[event_type]:
             self.subscribers[event_type].append(callback)
+            self._refresh_handle(event_type)
             logger.debug(f"Subscribed to event: {event_type}")
     
     def unsubscribe(self, event_type: str, callback: Callable) -> None:
@@ -60,6 +96,7 @@ class EventBus:
         """
         if event_type in self.subscribers and callback in self.subscribers[event_type]:
             self.subscribers[event_type].remove(callback)
+            self._refresh_handle(event_type)
             logger.debug(f"Unsubscribed from event: {event_type}")
     
     def publish(self, event_type: str, data: Any = None) -> None:
@@ -70,7 +107,46 @@ class EventBus:
             event_type: Type of event to publish
             data: Data associated with the event
         """
-        # Store in history
+        self._record_history(event_type, data)
+        
+        # Notify subscribers
+        if event_type in self.subscribers:
+            for callback in self.subscribers[event_type][:]:  # Copy to avoid modification during iteration
+                try:
+                    callback(data)
+                except Exception as e:
+                    logger.error(f"Error in event handler for {event_type}: {str(e)}")
+        
+        logger.debug(f"Published event: {event_type}")
+    
+    def publish_fast(self, handle: int, data: Any = None) -> None:
+        """
+        Publish an event through a handle returned by resolve.
+        
+        Subscribers are called from a snapshot kept up to date by
+        subscribe/unsubscribe, so no per-publish lookup or list copy is needed.
+        
+        Args:
+            handle: Handle of the event type
+            data: Data associated with the event
+        """
+        event_type = self._handle_names[handle]
+        self._record_history(event_type, data)
+        
+        for callback in self._handle_subscribers[handle]:
+            try:
+                callback(data)
+            except Exception as e:
+                logger.error(f"Error in event handler for {event_type}: {str(e)}")
+    
+    def _record_history(self, event_type: str, data: Any) -> None:
+        """
+        Store an event in the history.
+        
+        Args:
+            event_type: Type of event
+            data: Data associated with the event
+        """
         if event_type not in self.history:
             self.history[event_type] = []
         
@@ -82,16 +158,6 @@ class EventBus:
         # Trim history if needed
         if len(self.history[event_type]) > self.max_history:
             self.history[event_type] = self.history[event_type][-self.max_history:]
-        
-        # Notify subscribers
-        if event_type in self.subscribers:
-            for callback in self.subscribers[event_type][:]:  # Copy to avoid modification during iteration
-                try:
-                    callback(data)
-                except Exception as e:
-                    logger.error(f"Error in event handler for {event_type}: {str(e)}")
-        
-        logger.debug(f"Published event: {event_type}")
     
     def get_history(self, event_type: str = None) -> Dict:
         """
@@ -17,6 +17,60 @@ from config.scraper_config import RANDOM_SITES, STATES, EVENTS, LINKEDIN_FEED_UR
 
 logger = logging.getLogger(__name__)
 
+def _disable_stack_capture() -> None:
+    """
+    Stop Playwright from capturing the Python call stack on every API call.
+    
+    Playwright records the caller's stack with inspect.stack() for its error
+    messages and traces, which takes a large share of the time spent in each
+    sync API call. Errors lose their Python call site, so this is opt-in via
+    PW_INSPECT_STACK=0.
+    """
+    try:
+        import inspect
+        from playwright._impl import _connection
+    except ImportError:
+        return
+    
+    if getattr(_connection, "inspect", None) is not inspect:
+        logger.warning("Playwright internals changed; leaving stack capture enabled")
+        return
+    
+    class _InspectWithoutStack:
+        """inspect module stand-in whose stack() returns no frames."""
+        
+        def __getattr__(self, name: str) -> Any:
+            return getattr(inspect, name)
+        
+        @staticmethod
+        def stack(*args, **kwargs) -> list:
+            return []
+    
+    _connection.inspect = _InspectWithoutStack()
+    logger.info("Playwright call stack capture disabled (PW_INSPECT_STACK=0)")
+
+if os.environ.get("PW_INSPECT_STACK") == "0":
+    _disable_stack_capture()
+
+# Random sites are handed out without replacement, reshuffling once all were used
+_site_pool = list(RANDOM_SITES)
+_site_iter = iter(())
+
+def _next_random_site() -> str:
+    """
+    Get the next site from the shuffled RANDOM_SITES pool.
+    
+    Returns:
+        URL of a random site
+    """
+    global _site_iter
+    site = next(_site_iter, None)
+    if site is None:
+        random.shuffle(_site_pool)
+        _site_iter = iter(_site_pool)
+        site = next(_site_iter)
+    return site
+
 class PlaywrightDriver:
     """
     A streamlined utility class to manage Playwright browser automation.
@@ -26,29 +80,33 @@ class PlaywrightDriver:
     
     Supports multiple operation modes:
     - basic: No cookies or profile (default)
-    - cookies_mode: Load cookies for authentication
+    - cookies_mode: Load cookies (or a saved Playwright storage state) for authentication
     - profile_mode: Use a persistent Chrome profile
+    - cdp_mode: Attach to an already running Chrome over the DevTools protocol
     """
     
     def __init__(
         self, 
-        mode: Literal["basic", "cookies_mode", "profile_mode"] = "basic",
+        mode: Literal["basic", "cookies_mode", "profile_mode", "cdp_mode"] = "basic",
         cookies_file: Optional[str] = None,
         profile_path: Optional[str] = None,
         headless: bool = True,
-        user_agent_type: str = "default"
+        user_agent_type: str = "default",
+        cdp_endpoint: Optional[str] = None
     ):
         """
         Initialize the PlaywrightDriver with the specified mode.
         
         Args:
-            mode: Operation mode ("basic", "cookies_mode", or "profile_mode")
-            cookies_file: Path to a JSON file containing cookies for authentication (for cookies_mode)
+            mode: Operation mode ("basic", "cookies_mode", "profile_mode", or "cdp_mode")
+            cookies_file: Path to a JSON file containing cookies or a Playwright storage state (for cookies_mode)
             profile_path: Path to Chrome profile directory (for profile_mode)
             headless: Whether to run browser in headless mode (True) or with visible UI (False)
             user_agent_type: Type of user agent to use ("default", "random", or "mobile")
+            cdp_endpoint: DevTools endpoint of a running Chrome, e.g. http://localhost:9222 (for cdp_mode)
         """
         self.mode = mode
+        self.cdp_endpoint = cdp_endpoint
         self.cookies_file = cookies_file
         self.profile_path = profile_path
         self.headless = headless
@@ -60,6 +118,8 @@ class PlaywrightDriver:
         self.context = None
         self.page = None
         self.pages = []  # Track all pages/tabs
+        self._warm_pages = {}  # URL -> page already navigated by prefetch()
+        self._storage_state = None  # Storage state loaded from cookies_file, if it holds one
         
         # Validate configuration based on mode
         self._validate_config()
@@ -72,6 +132,9 @@ class PlaywrightDriver:
         if self.mode == "profile_mode" and not self.profile_path:
             logger.warning("profile_mode selected but no profile_path provided")
             
+        if self.mode == "cdp_mode" and not self.cdp_endpoint:
+            logger.warning("cdp_mode selected but no cdp_endpoint provided")
+            
         if self.mode == "basic" and (self.cookies_file or self.profile_path):
             logger.warning("basic mode selected but cookies_file or profile_path was provided (these will be ignored)")
 
@@ -100,7 +163,20 @@ class PlaywrightDriver:
             }
             
             # Launch browser differently based on mode
-            if self.mode == "profile_mode" and self.profile_path:
+            if self.mode == "cdp_mode":
+                # Attach to the running browser and reuse its default (logged-in) context
+                self.browser = self.playwright.chromium.connect_over_cdp(self.cdp_endpoint)
+                logger.info(f"Connected to Chrome over CDP at {self.cdp_endpoint}")
+                
+                if self.browser.contexts:
+                    self.context = self.browser.contexts[0]
+                else:
+                    self.context = self.browser.new_context(**context_options)
+                
+                # Work in our own tab so the browser's existing tabs are left alone
+                self.page = self.context.new_page()
+                self.pages = [self.page]
+            elif self.mode == "profile_mode" and self.profile_path:
                 # For profile mode, we need to separate the user data dir from the profile name
                 if "Profile " in self.profile_path:
                     # Path contains a specific profile directory
@@ -142,12 +218,21 @@ class PlaywrightDriver:
                 # For basic and cookies_mode, use regular launch
                 self.browser = self.playwright.chromium.launch(**launch_options)
                 
-                # Create context with appropriate options
-                self.context = self.browser.new_context(**context_options)
-                
-                # Handle cookies in cookies_mode
+                # A saved storage state restores local storage as well as cookies,
+                # so LinkedIn doesn't have to rebuild the session on first visit
                 if self.mode == "cookies_mode" and self.cookies_file:
-                    self._load_cookies(self.context)
+                    self._storage_state = self._load_storage_state()
+                
+                # Create context with appropriate options
+                if self._storage_state:
+                    self.context = self.browser.new_context(storage_state=self._storage_state, **context_options)
+                    logger.info(f"Restored storage state from {self.cookies_file}")
+                else:
+                    self.context = self.browser.new_context(**context_options)
+                    
+                    # Handle cookies in cookies_mode
+                    if self.mode == "cookies_mode" and self.cookies_file:
+                        self._load_cookies(self.context)
                 
                 # Create a page
                 self.page = self.context.new_page()
@@ -215,6 +300,13 @@ class PlaywrightDriver:
         Returns:
             True if navigation succeeded, False otherwise
         """
+        # Reuse a page that prefetch() already started loading; any other
+        # navigation means it won't be visited, so don't leave it open
+        if self._warm_pages:
+            if page_index is None and url in self._warm_pages and self._adopt_warm_page(url, wait_until):
+                return True
+            self._discard_warm_pages()
+        
         target_page = self._get_page(page_index)
         
         if not target_page:
@@ -239,6 +331,147 @@ class PlaywrightDriver:
             logger.error(f"Failed to navigate to {url}: {str(e)}")
             return False
     
+    def soft_navigate(self, url: str, ready_selector: str, timeout: int = 3000, page_index: Optional[int] = None) -> bool:
+        """
+        Navigate through the page's client-side router instead of a full page load.
+        
+        Pushes the URL onto the history stack and fires popstate so a
+        single-page app can render the route in place. Does nothing when the
+        page exposes no client-side router (window.__APP_NAVIGATION__), so the
+        history is left alone and no selector wait is spent. Succeeds only if
+        ready_selector shows up; callers should fall back to navigate().
+        
+        Args:
+            url: The URL to route to
+            ready_selector: CSS selector that marks the target route as rendered
+            timeout: Maximum time to wait for ready_selector in milliseconds
+            page_index: Optional index of the page/tab to use (None for current active page)
+            
+        Returns:
+            True if the route rendered in place, False otherwise
+        """
+        target_page = self._get_page(page_index)
+        
+        if not target_page:
+            logger.error(f"Cannot navigate: No page available at index {page_index}.")
+            return False
+            
+        try:
+            routed = target_page.evaluate(
+                """url => {
+                    if (!window.__APP_NAVIGATION__) {
+                        return false;
+                    }
+                    window.history.pushState({}, '', url);
+                    window.dispatchEvent(new PopStateEvent('popstate', { state: {} }));
+                    return true;
+                }""",
+                url
+            )
+            if not routed:
+                logger.debug(f"No client-side router on the page; not routing to {url} in place")
+                return False
+            
+            target_page.wait_for_selector(ready_selector, state="attached", timeout=timeout)
+            logger.info(f"Navigated to {url} (client-side)")
+            return True
+        except Exception as e:
+            logger.debug(f"Client-side navigation to {url} failed: {str(e)}")
+            return False
+    
+    def prefetch(self, url: str, timeout: float = 15.0) -> bool:
+        """
+        Start loading a URL in a background tab so a later navigate() can reuse it.
+        
+        Only waits for the navigation to commit; the rest of the page keeps
+        loading in the browser while the caller is idle. Only call it once
+        any browsing that should precede the visit is done, e.g. after the
+        feed for a profile. The page is closed if the next navigate() goes
+        anywhere else.
+        
+        Args:
+            url: The URL to prefetch
+            timeout: Maximum seconds to wait for the navigation to commit
+            
+        Returns:
+            True if the page was parked for reuse, False otherwise
+        """
+        if not self.context:
+            logger.error("Cannot prefetch: No context available. Call start() first.")
+            return False
+        
+        # Only keep one page warm at a time
+        self._discard_warm_pages()
+        
+        warm_page = None
+        try:
+            warm_page = self.context.new_page()
+            if warm_page not in self.pages:
+                self.pages.append(warm_page)
+            
+            response = warm_page.goto(url, wait_until="commit", timeout=timeout * 1000)
+            if not response:
+                raise RuntimeError("no response")
+            
+            self._warm_pages[url] = warm_page
+            logger.info(f"Prefetching {url} (status: {response.status})")
+            return True
+        except Exception as e:
+            logger.warning(f"Failed to prefetch {url}: {str(e)}")
+            if warm_page:
+                self._close_tracked_page(warm_page)
+            return False
+    
+    def _adopt_warm_page(self, url: str, wait_until: str) -> bool:
+        """
+        Make a prefetched page the active page in place of the current one.
+        
+        Args:
+            url: URL the page was prefetched for
+            wait_until: Load state to wait for before returning
+            
+        Returns:
+            True if the prefetched page is now active, False otherwise
+        """
+        warm_page = self._warm_pages.pop(url)
+        try:
+            if wait_until != "commit":
+                warm_page.wait_for_load_state(wait_until)
+            
+            previous_page = self.page
+            self.page = warm_page
+            warm_page.bring_to_front()
+            
+            if previous_page and previous_page is not warm_page:
+                self._close_tracked_page(previous_page)
+            
+            logger.info(f"Navigated to {url} (prefetched)")
+            return True
+        except Exception as e:
+            logger.warning(f"Prefetched page for {url} unusable, navigating normally: {str(e)}")
+            self._close_tracked_page(warm_page)
+            return False
+    
+    def _discard_warm_pages(self) -> None:
+        """Close any prefetched pages that were never used."""
+        while self._warm_pages:
+            _, warm_page = self._warm_pages.popitem()
+            self._close_tracked_page(warm_page)
+    
+    def _close_tracked_page(self, page: Page) -> None:
+        """
+        Close a page and stop tracking it.
+        
+        Args:
+            page: The page to close
+        """
+        if page in self.pages:
+            self.pages.remove(page)
+        try:
+            page.close()
+        except Exception as e:
+            logger.debug(f"Error closing page: {str(e)}")
+    
     def _get_page(self, page_index: Optional[int] = None) -> Optional[Page]:
         """
         Get a page by index or the currently active page.
@@ -331,20 +564,8 @@ class PlaywrightDriver:
                 self.driver.switch_page(new_tab_index)
                 logger.info(f"Switched to new tab (index {new_tab_index})")
             
-            # Get a list of random, safe sites
-            random_sites = getattr(RANDOM_SITES, "sites", [
-                "https://www.wikipedia.org",
-                "https://www.weather.com",
-                "https://www.bbc.com",
-                "https://www.nytimes.com",
-                "https://www.reuters.com",
-                "https://www.nationalgeographic.com",
-                "https://www.forbes.com",
-                "https://www.time.com"
-            ])
-            
-            # Select a random site
-            random_site = random.choice(random_sites)
+            # Take the next site from the shuffled pool
+            random_site = _next_random_site()
             logger.info(f"Visiting random site: {random_site}")
             
             # Navigate to random site in the current tab (which should be the new tab if created)
@@ -591,6 +812,35 @@ class PlaywrightDriver:
             logger.error(f"Timed out waiting for selector {selector} after {timeout}ms: {str(e)}")
             return False
     
+    def wait_until_ready(self, selector: str = "main", timeout: int = 3000, page_index: Optional[int] = None) -> bool:
+        """
+        Wait until a page has parsed its DOM and rendered its main container.
+        
+        Meant to replace fixed "let the page settle" sleeps: returns as soon as
+        the page is ready, and never waits longer than the short timeout.
+        
+        Args:
+            selector: CSS selector that marks the page as rendered
+            timeout: Maximum time for each wait in milliseconds
+            page_index: Optional index of the page on which to wait
+            
+        Returns:
+            True if the page became ready, False if a wait timed out
+        """
+        target_page = self._get_page(page_index)
+        
+        if not target_page:
+            logger.error(f"Cannot wait for page: No page available at index {page_index}.")
+            return False
+            
+        try:
+            target_page.wait_for_load_state("domcontentloaded", timeout=timeout)
+            target_page.wait_for_selector(selector, state="attached", timeout=timeout)
+            return True
+        except Exception as e:
+            logger.debug(f"Page not ready after {timeout}ms, continuing: {str(e)}")
+            return False
+    
     def wait(self, seconds: float) -> None:
         """
         Wait for a specified number of seconds.
@@ -630,13 +880,14 @@ class PlaywrightDriver:
             logger.error(f"Failed to save cookies: {str(e)}")
             return False
     
-    def evaluate(self, javascript: str, page_index: Optional[int] = None) -> Any:
+    def evaluate(self, javascript: str, page_index: Optional[int] = None, arg: Any = None) -> Any:
         """
         Evaluate JavaScript code in the browser context.
         
         Args:
             javascript: JavaScript code to evaluate
             page_index: Optional index of the page on which to evaluate
+            arg: Optional serializable argument passed to the JavaScript function
             
         Returns:
             Result of the JavaScript evaluation
@@ -648,7 +899,7 @@ class PlaywrightDriver:
             return None
             
         try:
-            return target_page.evaluate(javascript)
+            return target_page.evaluate(javascript, arg)
         except Exception as e:
             logger.error(f"Failed to evaluate JavaScript: {str(e)}")
             return None
@@ -675,6 +926,26 @@ class PlaywrightDriver:
             logger.error(f"Failed to get current URL: {str(e)}")
             return None
     
+    def get_viewport_size(self, page_index: Optional[int] = None) -> Optional[Dict[str, int]]:
+        """
+        Get the viewport size Playwright has set for a page.
+        
+        This is known locally, so no round trip to the browser is needed.
+        
+        Args:
+            page_index: Optional index of the page
+            
+        Returns:
+            Dictionary with width and height, or None if the page has no fixed viewport
+        """
+        target_page = self._get_page(page_index)
+        
+        if not target_page:
+            logger.error(f"Cannot get viewport: No page available at index {page_index}.")
+            return None
+            
+        return target_page.viewport_size
+    
     def get_page_count(self) -> int:
         """
         Get the number of open pages/tabs.
@@ -702,6 +973,46 @@ class PlaywrightDriver:
         
         return options
 
+    def _load_storage_state(self) -> Optional[Dict[str, Any]]:
+        """
+        Load the cookies file if it holds a Playwright storage state.
+        
+        Returns:
+            Storage state dictionary, or None if the file holds a plain cookie list
+        """
+        try:
+            with open(self.cookies_file, 'r') as file:
+                state = json.load(file)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+        
+        if isinstance(state, dict) and "cookies" in state:
+            return state
+        return None
+    
+    def save_storage_state(self, path: Optional[str] = None) -> bool:
+        """
+        Save the context's cookies and local storage as a Playwright storage state.
+        
+        Args:
+            path: File to write (defaults to the cookies file)
+            
+        Returns:
+            bool: True if the state was saved, False otherwise
+        """
+        path = path or self.cookies_file
+        if not self.context or not path:
+            logger.error("Cannot save storage state: No browser context or path.")
+            return False
+        
+        try:
+            self.context.storage_state(path=path)
+            logger.info(f"Saved storage state to {path}")
+            return True
+        except Exception as e:
+            logger.error(f"Failed to save storage state: {str(e)}")
+            return False
+    
     def _load_cookies(self, context: BrowserContext) -> None:
         """Load cookies from file to the browser context."""
         try:
@@ -781,9 +1092,24 @@ class PlaywrightDriver:
     def close(self) -> None:
         """Close browser and clean up all resources."""
         try:
+            if self.mode == "cdp_mode":
+                # Only close our own tabs; the attached browser keeps running
+                for page in self.pages:
+                    try:
+                        page.close()
+                    except Exception as e:
+                        logger.debug(f"Error closing page: {str(e)}")
+                self.context = None
+            
             # Clear pages list first
             self.pages = []
             self.page = None
+            self._warm_pages = {}
+                
+            # Refresh a storage state file we started from, so the next run resumes this session
+            if self.context and self._storage_state:
+                self.save_storage_state()
+                self._storage_state = None
                 
             if self.context:
                 self.context.close()
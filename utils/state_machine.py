@@ -21,7 +21,18 @@ class StateMachine:
     Enforces valid state transitions and publishes events when state changes.
     """
     
-    def __init__(self, initial_state: str = STATES["INACTIVE"]):
+    _instance = None
+    _lock = threading.Lock()
+    
+    @classmethod
+    def get_instance(cls):
+        """Return the state machine shared by the brain and its workers."""
+        with cls._lock:
+            if cls._instance is None:
+                cls._instance = cls()
+            return cls._instance
+    
+    def __init__(self, initial_state: str = STATES.INACTIVE):
         """
         Initialize the state machine.
         
@@ -32,55 +43,57 @@ class StateMachine:
         self.state_history = []
         self.state_data = {}
         self.lock = threading.Lock()
+        # Reentrant so a subscriber may itself trigger a transition
+        self._publish_lock = threading.RLock()
         self.event_bus = EventBus.get_instance()
         
         # Define valid state transitions
         self.valid_transitions = {
-            STATES["INACTIVE"]: {
-                STATES["WAITING_FOR_ACTIVE_HOURS"],
-                STATES["ERROR"]
+            STATES.INACTIVE: {
+                STATES.WAITING_FOR_ACTIVE_HOURS,
+                STATES.ERROR
             },
-            STATES["WAITING_FOR_ACTIVE_HOURS"]: {
-                STATES["PLANNING_NEXT_SESSION"],
-                STATES["INACTIVE"],
-                STATES["ERROR"]
+            STATES.WAITING_FOR_ACTIVE_HOURS: {
+                STATES.PLANNING_NEXT_SESSION,
+                STATES.INACTIVE,
+                STATES.ERROR
             },
-            STATES["PLANNING_NEXT_SESSION"]: {
-                STATES["SESSION_STARTING"],
-                STATES["WAITING_FOR_ACTIVE_HOURS"],
-                STATES["INACTIVE"],
-                STATES["ERROR"]
+            STATES.PLANNING_NEXT_SESSION: {
+                STATES.SESSION_STARTING,
+                STATES.WAITING_FOR_ACTIVE_HOURS,
+                STATES.INACTIVE,
+                STATES.ERROR
             },
-            STATES["SESSION_STARTING"]: {
-                STATES["FEED_BROWSING"],
-                STATES["INACTIVE"],
-                STATES["ERROR"]
+            STATES.SESSION_STARTING: {
+                STATES.FEED_BROWSING,
+                STATES.INACTIVE,
+                STATES.ERROR
             },
-            STATES["FEED_BROWSING"]: {
-                STATES["PROFILE_SCRAPING"],
-                STATES["SESSION_ENDING"],
-                STATES["ERROR"]
+            STATES.FEED_BROWSING: {
+                STATES.PROFILE_SCRAPING,
+                STATES.SESSION_ENDING,
+                STATES.ERROR
             },
-            STATES["PROFILE_SCRAPING"]: {
-                STATES["PROFILE_SCRAPING"],  # Can stay in this state for multiple profiles
-                STATES["SESSION_ENDING"],
-                STATES["ERROR"]
+            STATES.PROFILE_SCRAPING: {
+                STATES.PROFILE_SCRAPING,  # Can stay in this state for multiple profiles
+                STATES.SESSION_ENDING,
+                STATES.ERROR
             },
-            STATES["SESSION_ENDING"]: {
-                STATES["COOLDOWN_PERIOD"],
-                STATES["INACTIVE"],
-                STATES["ERROR"]
+            STATES.SESSION_ENDING: {
+                STATES.COOLDOWN_PERIOD,
+                STATES.INACTIVE,
+                STATES.ERROR
             },
-            STATES["COOLDOWN_PERIOD"]: {
-                STATES["PLANNING_NEXT_SESSION"],
-                STATES["WAITING_FOR_ACTIVE_HOURS"],
-                STATES["INACTIVE"],
-                STATES["ERROR"]
+            STATES.COOLDOWN_PERIOD: {
+                STATES.PLANNING_NEXT_SESSION,
+                STATES.WAITING_FOR_ACTIVE_HOURS,
+                STATES.INACTIVE,
+                STATES.ERROR
             },
-            STATES["ERROR"]: {
-                STATES["INACTIVE"],
-                STATES["WAITING_FOR_ACTIVE_HOURS"],
-                STATES["PLANNING_NEXT_SESSION"]
+            STATES.ERROR: {
+                STATES.INACTIVE,
+                STATES.WAITING_FOR_ACTIVE_HOURS,
+                STATES.PLANNING_NEXT_SESSION
             }
         }
         
@@ -99,26 +112,29 @@ class StateMachine:
         Returns:
             True if transition was successful, False otherwise
         """
-        with self.lock:
-            if new_state not in self.valid_transitions.get(self.current_state, set()):
-                logger.error(
-                    f"Invalid state transition from {self.current_state} to {new_state}. "
-                    f"Valid transitions: {self.valid_transitions.get(self.current_state, set())}"
-                )
-                return False
-            
-            old_state = self.current_state
-            self.current_state = new_state
-            
-            # Update state data
-            if data:
-                self.state_data = data
-            
-            # Record the state change
-            self._record_state_change(new_state, old_state, reason)
+        # Transitions are serialized end to end so their events are published
+        # in the order the changes happened; the state lock itself is released
+        # before publishing so slow subscribers don't block readers
+        with self._publish_lock:
+            with self.lock:
+                if new_state not in self.valid_transitions.get(self.current_state, set()):
+                    logger.error(
+                        f"Invalid state transition from {self.current_state} to {new_state}. "
+                        f"Valid transitions: {self.valid_transitions.get(self.current_state, set())}"
+                    )
+                    return False
+                
+                old_state = self.current_state
+                self.current_state = new_state
+                
+                # Update state data
+                if data:
+                    self.state_data = data
+                
+                # Record the state change
+                self._record_state_change(new_state, old_state, reason)
             
-            # Publish event
-            self.event_bus.publish(EVENTS["SYSTEM_STATE_CHANGED"], {
+            self.event_bus.publish(EVENTS.SYSTEM_STATE_CHANGED, {
                 "old_state": old_state,
                 "new_state": new_state,
                 "reason": reason,